@@ -1,5 +1,6 @@
 """API package for EduBot."""
 
 from .gemini_client import GeminiAPI
+from .async_gemini_client import AsyncGeminiAPI
 
-__all__ = ['GeminiAPI']
\ No newline at end of file
+__all__ = ['GeminiAPI', 'AsyncGeminiAPI']
\ No newline at end of file
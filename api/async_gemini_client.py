@@ -0,0 +1,174 @@
+"""Asynchronous Gemini API client for concurrent workloads."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Union
+from config.settings import Config
+from api.gemini_client import GeminiAPI
+from api.scheduler import PRIORITY_INTERACTIVE, estimate_payload_tokens
+from utils.http import compute_backoff, parse_retry_after
+
+try:
+    import aiohttp
+    ASYNC_SUPPORT = True
+except ImportError:
+    ASYNC_SUPPORT = False
+
+class AsyncGeminiAPI(GeminiAPI):
+    """Asyncio-based Gemini client for fanning out several requests at once."""
+    
+    def __init__(self, api_key: str, base_url: Optional[str] = None) -> None:
+        """Initialize the async Gemini API client."""
+        super().__init__(api_key, base_url)
+        self._client_session = None
+    
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if async requests are supported."""
+        return ASYNC_SUPPORT
+    
+    async def __aenter__(self) -> "AsyncGeminiAPI":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP session."""
+        if self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
+    
+    def _get_client_session(self) -> "aiohttp.ClientSession":
+        """Return the pooled aiohttp session, creating it on first use."""
+        if self._client_session is None or self._client_session.closed:
+            connector = aiohttp.TCPConnector(limit=Config.HTTP_POOL_SIZE)
+            timeout = aiohttp.ClientTimeout(connect=Config.GEMINI_CONNECT_TIMEOUT,
+                                            sock_read=Config.GEMINI_READ_TIMEOUT)
+            self._client_session = aiohttp.ClientSession(connector=connector,
+                                                         timeout=timeout)
+        return self._client_session
+    
+    async def agenerate_response(self, messages: List[Dict[str, str]], model: str = None,
+                                 max_tokens: int = None, temperature: float = None,
+                                 image_data: Optional[Union[bytes, str]] = None,
+                                 images: Optional[List[Dict[str, Any]]] = None,
+                                 use_cache: bool = True,
+                                 cached_content: Optional[str] = None,
+                                 priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Generate response from Gemini API without blocking the event loop.
+        
+        Shares the scheduler, circuit breakers and fallback model with
+        ``generate_response``; hedging is left to the synchronous client.
+        """
+        if not ASYNC_SUPPORT:
+            return {"success": False, "error": "Async client not supported. Please install aiohttp."}
+        
+        model = model or Config.DEFAULT_MODEL
+        params = {"key": self.api_key}
+        payload = self._build_payload(messages, max_tokens, temperature, image_data, images,
+                                      cached_content)
+        
+        cache_key, cached = self._cache_lookup(model, payload, use_cache)
+        if cached is not None:
+            return cached
+        
+        tokens = estimate_payload_tokens(payload)
+        
+        async def admit() -> None:
+            if self.scheduler is not None:
+                await asyncio.wrap_future(self.scheduler.reserve(self.client_id, tokens,
+                                                                 priority))
+        
+        try:
+            # A cache entry is bound to its model, so it cannot fall back
+            target = self._route(model, allow_fallback=not cached_content)
+            url = f"{self.base_url}/{target}:generateContent"
+            await admit()
+            
+            started = time.monotonic()
+            try:
+                result = await self._post(url, params, payload, admit)
+            except Exception as e:
+                if self.resilience is not None:
+                    self.resilience.record(target, None, e)
+                raise
+            if self.resilience is not None:
+                self.resilience.record(target, time.monotonic() - started)
+            
+            if target != model:
+                # Do not pin a fallback model's answer under the primary's key
+                return dict(result, model=target)
+            
+            self._cache_store(cache_key, result)
+            return result
+        
+        except Exception as e:
+            return {"success": False, "error": str(e) or type(e).__name__}
+    
+    async def _post(self, url: str, params: Dict[str, str], payload: Dict[str, Any],
+                    admit: Callable[[], Awaitable[None]]) -> Dict[str, Any]:
+        """Send one generation request, retrying like ``request_with_retry``."""
+        session = self._get_client_session()
+        attempt = 0
+        while True:
+            try:
+                async with session.post(url, params=params, json=payload) as response:
+                    if (response.status in Config.RETRY_STATUS_CODES
+                            and attempt < Config.MAX_RETRIES):
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        if retry_after is None or retry_after <= Config.RETRY_AFTER_MAX:
+                            await asyncio.sleep(compute_backoff(attempt, retry_after))
+                            attempt += 1
+                            # Every retry is a new request against the rate limit
+                            await admit()
+                            continue
+                    
+                    response.raise_for_status()
+                    return self._process_response(await response.json())
+            
+            except aiohttp.ClientConnectionError:
+                if attempt >= Config.MAX_RETRIES:
+                    raise
+                await asyncio.sleep(compute_backoff(attempt))
+                attempt += 1
+                await admit()
+    
+    async def generate_batch(self, requests: List[Dict[str, Any]],
+                             concurrency: int = None,
+                             on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
+                             ) -> List[Dict[str, Any]]:
+        """Run many generation requests concurrently.
+        
+        Each request is a dict of ``agenerate_response`` keyword arguments.
+        Results are returned in the same order, with failures reported
+        per item rather than aborting the batch. ``on_result(index, result)``
+        is called as each request finishes, e.g. to report progress.
+        """
+        semaphore = asyncio.Semaphore(concurrency or Config.BATCH_CONCURRENCY)
+        
+        async def run(index: int, request: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await self.agenerate_response(**request)
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+            if on_result is not None:
+                on_result(index, result)
+            return result
+        
+        return await asyncio.gather(*(run(index, request)
+                                      for index, request in enumerate(requests)))
+    
+    def generate_batch_sync(self, requests: List[Dict[str, Any]],
+                            concurrency: int = None,
+                            on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
+                            ) -> List[Dict[str, Any]]:
+        """Run ``generate_batch`` from synchronous code such as a Streamlit script."""
+        async def run() -> List[Dict[str, Any]]:
+            try:
+                return await self.generate_batch(requests, concurrency, on_result)
+            finally:
+                await self.close()
+        
+        return asyncio.run(run())
@@ -0,0 +1,254 @@
+"""Gemini context caching (``cachedContents``) for uploaded document sets."""
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from config.settings import Config
+from utils.helpers import estimate_tokens
+from utils.http import get_http_session, request_with_retry
+
+class ContextCacheManager:
+    """Create, share, refresh and delete cached contents for document sets.
+    
+    Entries are keyed by a hash of the documents' content hashes and the
+    model, so sessions that upload the same files share one server-side
+    cache. Each session holding a handle counts as a reference; the entry is
+    deleted when the last reference is released and otherwise simply
+    expires on the server after ``ttl`` seconds without a refresh.
+    """
+    
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None,
+                 ttl: int = None, clock: Callable[[], float] = time.time) -> None:
+        """Initialize the manager.
+        
+        ``base_url`` is the models endpoint (as for ``GeminiAPI``); the
+        ``cachedContents`` collection lives next to it.
+        """
+        base_url = base_url or Config.GEMINI_BASE_URL
+        self.api_key = api_key
+        self.api_root = base_url.rsplit("/models", 1)[0]
+        self.ttl = ttl or Config.CONTEXT_CACHE_TTL
+        self.clock = clock
+        self.session = get_http_session("gemini")
+        self.timeout = (Config.GEMINI_CONNECT_TIMEOUT, Config.GEMINI_READ_TIMEOUT)
+        
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._failed: Dict[str, float] = {}
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        
+        self.created = 0
+        self.refreshed = 0
+        self.deleted = 0
+        self.failures = 0
+    
+    @staticmethod
+    def cache_model(model: str) -> Optional[str]:
+        """Return the cache-capable model version for ``model``, if any."""
+        return Config.CONTEXT_CACHE_MODELS.get(model)
+    
+    @staticmethod
+    def document_set_key(documents: List[Dict[str, Any]], model: str) -> str:
+        """Hash the document set (order-independent) together with the model."""
+        hashes = sorted(doc.get('hash') or hashlib.sha256(doc['content'].encode()).hexdigest()
+                        for doc in documents)
+        material = model + "\n" + "\n".join(hashes)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def format_documents(documents: List[Dict[str, Any]]) -> str:
+        """Render the full document set the way ``prepare_context`` labels documents."""
+        parts = ["UPLOADED DOCUMENTS:"]
+        for doc in documents:
+            parts.append(f"\n--- {doc['name']} ({doc['type']}) ---")
+            parts.append(doc['content'])
+        return "\n".join(parts)
+    
+    def acquire(self, documents: List[Dict[str, Any]],
+                model: str = None) -> Optional[Dict[str, str]]:
+        """Return a handle to a cache entry for ``documents``, creating it if needed.
+        
+        Returns None when caching is disabled, the model does not support it,
+        the documents are below the minimum cacheable size, or creation
+        failed recently; callers then inline the document text as before.
+        """
+        model = model or Config.DEFAULT_MODEL
+        cache_model = self.cache_model(model)
+        if not (Config.CONTEXT_CACHE_ENABLED and self.api_key and cache_model and documents):
+            return None
+        
+        text = self.format_documents(documents)
+        if estimate_tokens(text) < Config.CONTEXT_CACHE_MIN_TOKENS:
+            return None
+        
+        key = self.document_set_key(documents, cache_model)
+        while True:
+            with self._lock:
+                now = self.clock()
+                if self._failed.get(key, 0) > now:
+                    return None
+                
+                entry = self._entries.get(key)
+                if entry is not None and entry['expires_at'] > now:
+                    entry['refs'] += 1
+                    return self._handle(key, entry)
+                
+                # Another session is already creating this entry: wait for it
+                pending = self._pending.get(key)
+                if pending is None:
+                    pending = self._pending[key] = threading.Event()
+                    break
+            pending.wait(self.timeout[0] + self.timeout[1])
+        
+        try:
+            entry = self._create(cache_model, text)
+            with self._lock:
+                if entry is None:
+                    self._failed[key] = self.clock() + Config.CONTEXT_CACHE_RETRY_AFTER
+                    return None
+                self._entries[key] = entry
+                return self._handle(key, entry)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+    
+    def ensure(self, handle: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """Refresh the entry's TTL when it is close to expiring.
+        
+        Returns None if the entry is gone, so the caller falls back to inline
+        document text for this turn.
+        """
+        with self._lock:
+            entry = self._entries.get(handle['key'])
+            if entry is None or entry['name'] != handle['name']:
+                return None
+            
+            now = self.clock()
+            if entry['expires_at'] <= now:
+                del self._entries[handle['key']]
+                return None
+            
+            refresh = (entry['expires_at'] - now < Config.CONTEXT_CACHE_REFRESH_MARGIN
+                       and not entry['refreshing'])
+            if refresh:
+                entry['refreshing'] = True
+        
+        if refresh:
+            refreshed = self._refresh(entry)
+            with self._lock:
+                entry['refreshing'] = False
+                if not refreshed:
+                    if self._entries.get(handle['key']) is entry:
+                        del self._entries[handle['key']]
+                    return None
+        return handle
+    
+    def release(self, handle: Dict[str, str]) -> None:
+        """Drop one reference, deleting the server-side entry after the last one."""
+        with self._lock:
+            entry = self._entries.get(handle['key'])
+            if entry is None or entry['name'] != handle['name']:
+                return
+            
+            entry['refs'] -= 1
+            if entry['refs'] > 0:
+                return
+            del self._entries[handle['key']]
+        
+        self._delete(entry['name'])
+    
+    def _handle(self, key: str, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Build the small, session-storable reference to an entry."""
+        return {"key": key, "name": entry['name'], "model": entry['model']}
+    
+    def _create(self, cache_model: str, text: str) -> Optional[Dict[str, Any]]:
+        """POST a new cached content entry."""
+        payload = {
+            "model": f"models/{cache_model}",
+            "contents": [{"role": "user", "parts": [{"text": text}]}],
+            "ttl": f"{self.ttl}s"
+        }
+        expires_at = self.clock() + self.ttl
+        
+        try:
+            response = request_with_retry(self.session, "POST", f"{self.api_root}/cachedContents",
+                                          params={"key": self.api_key}, json=payload,
+                                          timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            self.failures += 1
+            return None
+        
+        self.created += 1
+        usage = data.get('usageMetadata') or {}
+        return {
+            "name": data['name'],
+            "model": cache_model,
+            "expires_at": expires_at,
+            "tokens": usage.get('totalTokenCount', 0),
+            "refs": 1,
+            "refreshing": False
+        }
+    
+    def _refresh(self, entry: Dict[str, Any]) -> bool:
+        """PATCH the entry's TTL."""
+        expires_at = self.clock() + self.ttl
+        try:
+            response = request_with_retry(self.session, "PATCH", f"{self.api_root}/{entry['name']}",
+                                          params={"key": self.api_key, "updateMask": "ttl"},
+                                          json={"ttl": f"{self.ttl}s"}, timeout=self.timeout)
+            response.raise_for_status()
+        except Exception:
+            self.failures += 1
+            return False
+        
+        entry['expires_at'] = expires_at
+        self.refreshed += 1
+        return True
+    
+    def _delete(self, name: str) -> None:
+        """DELETE an entry; failures are left to server-side expiry."""
+        try:
+            response = request_with_retry(self.session, "DELETE", f"{self.api_root}/{name}",
+                                          params={"key": self.api_key}, timeout=self.timeout)
+            response.raise_for_status()
+            self.deleted += 1
+        except Exception:
+            self.failures += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return entry and API call counters."""
+        with self._lock:
+            entries = len(self._entries)
+            tokens = sum(entry['tokens'] for entry in self._entries.values())
+        return {
+            "entries": entries,
+            "cached_tokens": tokens,
+            "created": self.created,
+            "refreshed": self.refreshed,
+            "deleted": self.deleted,
+            "failures": self.failures
+        }
+
+_manager: Optional[ContextCacheManager] = None
+_manager_lock = threading.Lock()
+
+def get_context_cache() -> ContextCacheManager:
+    """Return the process-wide context cache manager."""
+    global _manager
+    
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ContextCacheManager(Config.GEMINI_API_KEY)
+    return _manager
+
+def set_context_cache(manager: Optional[ContextCacheManager]) -> None:
+    """Replace the process-wide manager, e.g. with one pointed at a fake endpoint."""
+    global _manager
+    
+    with _manager_lock:
+        _manager = manager
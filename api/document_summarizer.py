@@ -0,0 +1,226 @@
+"""Map-reduce summarization of long uploaded documents."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from config.settings import Config
+from processors.document_cache import content_hash, get_document_cache
+from processors.document_sections import split_sections
+from utils.helpers import estimate_tokens
+from api.async_gemini_client import AsyncGeminiAPI
+from api.scheduler import PRIORITY_BACKGROUND
+
+# Bump when the prompts change so cached section summaries are rebuilt
+SUMMARY_VERSION = "1"
+
+SECTION_PROMPT = (
+    "Summarize the following section of a longer document for a student in at most "
+    "{words} words. Keep definitions, key arguments, names, dates, formulas and "
+    "conclusions. Do not add information that is not in the text.\n\n"
+    "SECTION: {title}\n\n{text}"
+)
+
+COMBINE_PROMPT = (
+    "The following are summaries of consecutive sections of a longer document. "
+    "Combine them into one summary of at most {words} words that keeps the order "
+    "and the section titles.\n\n{text}"
+)
+
+ProgressCallback = Callable[[int, int, str], None]
+
+class SectionSummary(NamedTuple):
+    """Summary of one section (or of a group of consecutive sections)."""
+    document: str
+    title: str
+    summary: Optional[str]
+
+class DocumentSummarizer:
+    """Summarize whole documents by fanning sections out to Gemini in parallel.
+    
+    Each document is split into sections (chapters where headings are
+    found), the sections are summarized concurrently with at most
+    ``concurrency`` requests in flight, and the summaries are returned in
+    document order for the final answer. Wall-clock time therefore grows
+    with ``sections / concurrency`` rather than with page count.
+    
+    Section summaries are cached in the document cache by the hash of the
+    prompt, so asking again about the same book (in any session, under any
+    file name) only pays for the final answer. If the summaries together
+    exceed ``Config.SUMMARY_REDUCE_TOKEN_BUDGET``, consecutive summaries are
+    combined in further parallel rounds until they fit.
+    """
+    
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None,
+                 model: str = None, concurrency: int = None) -> None:
+        """Initialize the summarizer."""
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model = model or Config.SUMMARY_MAP_MODEL
+        self.concurrency = concurrency or Config.SUMMARY_CONCURRENCY
+        self.cache = get_document_cache()
+        self._lock = threading.Lock()
+        
+        self.runs = 0
+        self.sections = 0
+        self.cache_hits = 0
+        self.calls = 0
+        self.failures = 0
+        self.last_seconds = 0.0
+    
+    @staticmethod
+    def needs_map_reduce(documents: List[Dict[str, Any]]) -> bool:
+        """Check whether the documents are too long to send as selected passages."""
+        total = sum(estimate_tokens(doc['content']) for doc in documents)
+        return total > Config.DOCUMENT_CONTEXT_TOKEN_BUDGET
+    
+    def summarize(self, documents: List[Dict[str, Any]], client_id: Optional[str] = None,
+                  on_progress: Optional[ProgressCallback] = None) -> List[SectionSummary]:
+        """Summarize every section of ``documents`` and reduce to the token budget.
+        
+        ``client_id`` puts the requests in the calling session's scheduler
+        queue; ``on_progress(done, total, title)`` is called as sections finish.
+        """
+        started = time.perf_counter()
+        words = Config.SUMMARY_MAP_MAX_TOKENS * 3 // 4
+        
+        jobs = []
+        for doc in documents:
+            for section in split_sections(doc['content']):
+                prompt = SECTION_PROMPT.format(words=words, title=section.title, text=section.text)
+                jobs.append((doc['name'], section.title, prompt))
+        
+        with self._lock:
+            self.runs += 1
+            self.sections += len(jobs)
+        
+        summaries = self._run(jobs, client_id, on_progress)
+        
+        # Combine neighbouring summaries until the final prompt fits
+        while (len(summaries) > 1 and
+               sum(estimate_tokens(s.summary or "") for s in summaries) > Config.SUMMARY_REDUCE_TOKEN_BUDGET):
+            jobs = [
+                (group[0].document, self._group_title(group),
+                 COMBINE_PROMPT.format(words=words, text=self.format_summaries(group)))
+                for group in self._groups(summaries)
+            ]
+            summaries = self._run(jobs, client_id, on_progress)
+        
+        with self._lock:
+            self.last_seconds = time.perf_counter() - started
+        return summaries
+    
+    def _run(self, jobs: List[tuple], client_id: Optional[str],
+             on_progress: Optional[ProgressCallback]) -> List[SectionSummary]:
+        """Summarize ``(document, title, prompt)`` jobs, serving cached ones first."""
+        results: List[Optional[str]] = [None] * len(jobs)
+        keys = [self.cache.make_key(content_hash(prompt.encode("utf-8")), "section",
+                                    SUMMARY_VERSION, f"summary:{self.model}")
+                for _, _, prompt in jobs]
+        
+        pending = []
+        for index, key in enumerate(keys):
+            results[index] = self.cache.get(key)
+            if results[index] is None:
+                pending.append(index)
+        
+        done = len(jobs) - len(pending)
+        with self._lock:
+            self.cache_hits += done
+        if on_progress is not None:
+            on_progress(done, len(jobs), "cached sections")
+        
+        if pending:
+            client = AsyncGeminiAPI(self.api_key, self.base_url)
+            if client_id is not None:
+                client.client_id = client_id
+            requests = [{
+                "messages": [{"role": "user", "content": jobs[index][2]}],
+                "model": self.model,
+                "max_tokens": Config.SUMMARY_MAP_MAX_TOKENS,
+                "temperature": 0.3,
+                # Kept in the document cache instead
+                "use_cache": False,
+                # Other sessions' chat turns go first
+                "priority": PRIORITY_BACKGROUND
+            } for index in pending]
+            
+            def on_result(position: int, result: Dict[str, Any]) -> None:
+                nonlocal done
+                index = pending[position]
+                done += 1
+                if result.get("success"):
+                    results[index] = result["answer"]
+                    self.cache.set(keys[index], result["answer"])
+                if on_progress is not None:
+                    on_progress(done, len(jobs), jobs[index][1])
+            
+            outcomes = client.generate_batch_sync(requests, self.concurrency, on_result)
+            with self._lock:
+                self.calls += len(outcomes)
+                self.failures += sum(1 for result in outcomes if not result.get("success"))
+        
+        return [SectionSummary(document, title, results[index])
+                for index, (document, title, _) in enumerate(jobs)]
+    
+    @staticmethod
+    def _groups(summaries: List[SectionSummary]) -> List[List[SectionSummary]]:
+        """Split consecutive summaries into as many groups as fit the reduce budget."""
+        target = max(1, Config.SUMMARY_REDUCE_TOKEN_BUDGET // Config.SUMMARY_MAP_MAX_TOKENS)
+        # At least pairs, so every round shrinks the list
+        size = max(2, -(-len(summaries) // target))
+        return [summaries[i:i + size] for i in range(0, len(summaries), size)]
+    
+    @staticmethod
+    def _group_title(group: List[SectionSummary]) -> str:
+        """Title a group of summaries by its first and last section."""
+        first, last = group[0], group[-1]
+        if len(group) == 1:
+            return first.title
+        if first.document != last.document:
+            return f"{first.title} - {last.document}: {last.title}"
+        return f"{first.title} - {last.title}"
+    
+    @staticmethod
+    def format_summaries(summaries: List[SectionSummary]) -> str:
+        """Render summaries in document order, grouped under document names."""
+        parts = []
+        document = None
+        for summary in summaries:
+            if summary.document != document:
+                document = summary.document
+                parts.append(f"\n--- {document} ---")
+            parts.append(f"\n## {summary.title}")
+            parts.append(summary.summary or "[Summary unavailable for this section]")
+        return "\n".join(parts)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return section, cache and API call counters."""
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "sections": self.sections,
+                "cache_hits": self.cache_hits,
+                "calls": self.calls,
+                "failures": self.failures,
+                "last_seconds": self.last_seconds
+            }
+
+_summarizer: Optional[DocumentSummarizer] = None
+_summarizer_lock = threading.Lock()
+
+def get_document_summarizer() -> DocumentSummarizer:
+    """Return the process-wide document summarizer."""
+    global _summarizer
+    
+    if _summarizer is None:
+        with _summarizer_lock:
+            if _summarizer is None:
+                _summarizer = DocumentSummarizer(Config.GEMINI_API_KEY)
+    return _summarizer
+
+def set_document_summarizer(summarizer: Optional[DocumentSummarizer]) -> None:
+    """Replace the process-wide summarizer, e.g. with one pointed at a fake endpoint."""
+    global _summarizer
+    
+    with _summarizer_lock:
+        _summarizer = summarizer
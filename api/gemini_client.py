@@ -1,32 +1,276 @@
 """Gemini API client for EduBot."""
 
-import requests
-from typing import Dict, Any, List, Optional
+import base64
+import itertools
+import json
+import time
+import uuid
+from typing import Callable, Dict, Any, List, Optional, Iterator, Union
 from config.settings import Config
+from utils.http import get_http_session, request_with_retry
+from api.response_cache import ResponseCache, get_response_cache
+from api.scheduler import PRIORITY_INTERACTIVE, estimate_payload_tokens, get_scheduler
+from api.resilience import get_resilience, is_service_failure
 
 class GeminiAPI:
     """Gemini API client for generating responses."""
     
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, base_url: Optional[str] = None) -> None:
         """Initialize the Gemini API client."""
         self.api_key = api_key
-        self.base_url = Config.GEMINI_BASE_URL
+        self.base_url = base_url or Config.GEMINI_BASE_URL
+        self.last_stream_result: Dict[str, Any] = {}
+        self.session = get_http_session("gemini")
+        self.timeout = (Config.GEMINI_CONNECT_TIMEOUT, Config.GEMINI_READ_TIMEOUT)
+        self.cache = get_response_cache() if Config.RESPONSE_CACHE_ENABLED else None
+        self.scheduler = get_scheduler() if Config.SCHEDULER_ENABLED else None
+        self.resilience = get_resilience()
+        # Identifies this client (one per Streamlit session) for fair queuing
+        self.client_id = uuid.uuid4().hex
     
     def generate_response(self, messages: List[Dict[str, str]], model: str = None,
                          max_tokens: int = None, temperature: float = None, 
-                         image_data: Optional[str] = None) -> Dict[str, Any]:
-        """Generate response from Gemini API with optional image support."""
+                         image_data: Optional[Union[bytes, str]] = None,
+                         images: Optional[List[Dict[str, Any]]] = None,
+                         use_cache: bool = True,
+                         cached_content: Optional[str] = None,
+                         priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """Generate response from Gemini API with optional image support.
         
-        # Use defaults from config if not provided
-        model = model or Config.DEFAULT_MODEL
-        max_tokens = max_tokens or Config.DEFAULT_MAX_TOKENS
-        temperature = temperature or Config.DEFAULT_TEMPERATURE
+        ``cached_content`` names a ``cachedContents/...`` entry whose contents
+        precede ``messages``; ``model`` must match the model it was created for.
+        Requests pass through the shared scheduler, where ``priority`` orders
+        interactive turns ahead of background work.
+        """
         
+        model = model or Config.DEFAULT_MODEL
         url = f"{self.base_url}/{model}:generateContent"
         params = {"key": self.api_key}
+        payload = self._build_payload(messages, max_tokens, temperature, image_data, images,
+                                      cached_content)
+        
+        cache_key, cached = self._cache_lookup(model, payload, use_cache)
+        if cached is not None:
+            return cached
+        
+        tokens = estimate_payload_tokens(payload)
+        
+        try:
+            # A cache entry is bound to its model, so it cannot fall back
+            target = self._route(model, allow_fallback=not cached_content)
+            url = f"{self.base_url}/{target}:generateContent"
+            
+            def send() -> Dict[str, Any]:
+                response = request_with_retry(self.session, "POST", url, params=params,
+                                              json=payload, timeout=self.timeout,
+                                              before_retry=self._readmit(tokens, priority))
+                response.raise_for_status()
+                return self._process_response(response.json())
+            
+            def call() -> Dict[str, Any]:
+                if self.resilience is None:
+                    return send()
+                return self.resilience.call(target, send, can_hedge=lambda: self._can_hedge(tokens))
+            
+            if self.scheduler is None:
+                result = call()
+            else:
+                result = self.scheduler.run(self.client_id, tokens, call,
+                                            key=ResponseCache.make_key(target, payload),
+                                            priority=priority)
+            
+            if target != model:
+                # Do not pin a fallback model's answer under the primary's key
+                return dict(result, model=target)
+            
+            self._cache_store(cache_key, result)
+            return result
+        
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def generate_response_stream(self, messages: List[Dict[str, str]], model: str = None,
+                                 max_tokens: int = None, temperature: float = None,
+                                 image_data: Optional[Union[bytes, str]] = None,
+                                 images: Optional[List[Dict[str, Any]]] = None,
+                                 use_cache: bool = True,
+                                 cached_content: Optional[str] = None,
+                                 priority: int = PRIORITY_INTERACTIVE) -> Iterator[str]:
+        """Stream response text chunks from Gemini API as they are generated.
+        
+        The final result (same shape as ``generate_response``) is stored in
+        ``self.last_stream_result`` once the generator is exhausted.
+        """
+        model = model or Config.DEFAULT_MODEL
+        url = f"{self.base_url}/{model}:streamGenerateContent"
+        params = {"key": self.api_key, "alt": "sse"}
+        payload = self._build_payload(messages, max_tokens, temperature, image_data, images,
+                                      cached_content)
+        
+        cache_key, cached = self._cache_lookup(model, payload, use_cache)
+        if cached is not None:
+            self.last_stream_result = cached
+            yield cached["answer"]
+            return
+        
+        self.last_stream_result = {"success": False, "error": "Stream did not complete"}
+        answer_parts = []
+        usage = {}
+        
+        target = model
+        opened = False
+        started = time.monotonic()
+        try:
+            target = self._route(model, allow_fallback=not cached_content)
+            url = f"{self.base_url}/{target}:streamGenerateContent"
+            
+            # Streams cannot be shared, so they only wait for admission
+            tokens = estimate_payload_tokens(payload)
+            if self.scheduler is not None:
+                self.scheduler.reserve(self.client_id, tokens, priority).result()
+            
+            def open_stream() -> tuple:
+                response = request_with_retry(self.session, "POST", url, params=params,
+                                              json=payload, stream=True, timeout=self.timeout,
+                                              before_retry=self._readmit(tokens, priority))
+                try:
+                    response.raise_for_status()
+                    events = self._iter_sse_events(response)
+                    first = next(events, None)
+                except BaseException:
+                    response.close()
+                    raise
+                if first is not None:
+                    events = itertools.chain([first], events)
+                return response, events
+            
+            if self.resilience is None:
+                response, events = open_stream()
+            else:
+                # Hedged on time to first chunk; the slower stream is closed
+                response, events = self.resilience.call(
+                    target, open_stream, can_hedge=lambda: self._can_hedge(tokens),
+                    window=self.resilience.first_chunk_window(target),
+                    discard=lambda stream: stream[0].close()
+                )
+            opened = True
+            
+            with response:
+                for data in events:
+                    if data.get('usageMetadata'):
+                        usage = data['usageMetadata']
+                    
+                    candidates = data.get('candidates') or []
+                    if not candidates:
+                        continue
+                    
+                    candidate = candidates[0]
+                    if candidate.get('finishReason') == 'SAFETY':
+                        self.last_stream_result = {
+                            "success": False,
+                            "error": "Response blocked by safety filters"
+                        }
+                        return
+                    
+                    for part in candidate.get('content', {}).get('parts', []):
+                        text = part.get('text', '')
+                        if text:
+                            answer_parts.append(text)
+                            yield text
+            
+            if not answer_parts:
+                self.last_stream_result = {"success": False, "error": "No response generated"}
+                return
+            
+            self.last_stream_result = {
+                "success": True,
+                "answer": "".join(answer_parts),
+                "usage": usage
+            }
+            if self.resilience is not None:
+                self.resilience.window(target).record(time.monotonic() - started, True)
+            
+            if target != model:
+                self.last_stream_result["model"] = target
+            else:
+                self._cache_store(cache_key, self.last_stream_result)
+        
+        except Exception as e:
+            if self.resilience is not None and is_service_failure(e):
+                # Failures before the first chunk were already fed to the breaker
+                if opened:
+                    self.resilience.breaker(target).record_failure()
+                self.resilience.window(target).record(None, False)
+            self.last_stream_result = {"success": False, "error": str(e)}
+    
+    def _route(self, model: str, allow_fallback: bool = True) -> str:
+        """Pick ``model`` or its fallback according to the circuit breakers."""
+        if self.resilience is None:
+            return model
+        return self.resilience.route(model, allow_fallback)
+    
+    def _readmit(self, tokens: int, priority: int) -> Optional[Callable[[], None]]:
+        """Return a hook that waits for a new scheduler slot before each retry.
+        
+        Without it, retries of a 429 or 5xx would resend outside the
+        requests- and tokens-per-minute limits.
+        """
+        if self.scheduler is None:
+            return None
+        return lambda: self.scheduler.reserve(self.client_id, tokens, priority).result()
+    
+    def _can_hedge(self, tokens: int) -> bool:
+        """Allow a hedge only when the shared quota has room to spare."""
+        return self.scheduler is None or self.scheduler.try_admit(tokens)
+    
+    def _cache_lookup(self, model: str, payload: Dict[str, Any],
+                      use_cache: bool) -> tuple:
+        """Return ``(cache_key, cached_response)`` for a request payload."""
+        if self.cache is None or not use_cache:
+            return None, None
+        
+        cache_key = ResponseCache.make_key(model, payload)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached = dict(cached, cached=True)
+        return cache_key, cached
+    
+    def _cache_store(self, cache_key: Optional[str], result: Dict[str, Any]) -> None:
+        """Store a successful response under ``cache_key``."""
+        if self.cache is not None and cache_key is not None:
+            self.cache.set(cache_key, result)
+    
+    @staticmethod
+    def _iter_sse_events(response) -> Iterator[Dict[str, Any]]:
+        """Parse server-sent events into decoded JSON payloads."""
+        data_lines = []
+        
+        for line in response.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            
+            if line.startswith('data:'):
+                data_lines.append(line[5:].lstrip())
+            elif not line and data_lines:
+                yield json.loads("\n".join(data_lines))
+                data_lines = []
+        
+        if data_lines:
+            yield json.loads("\n".join(data_lines))
+    
+    def _build_payload(self, messages: List[Dict[str, str]], max_tokens: int = None,
+                       temperature: float = None,
+                       image_data: Optional[Union[bytes, str]] = None,
+                       images: Optional[List[Dict[str, Any]]] = None,
+                       cached_content: Optional[str] = None) -> Dict[str, Any]:
+        """Build the request payload shared by all generation endpoints."""
+        
+        # Use defaults from config if not provided
+        max_tokens = max_tokens or Config.DEFAULT_MAX_TOKENS
+        temperature = temperature or Config.DEFAULT_TEMPERATURE
         
         # Convert messages to Gemini format
-        contents = self._convert_messages_to_gemini_format(messages, image_data)
+        contents = self._convert_messages_to_gemini_format(messages, image_data, images)
         
         payload = {
             "contents": contents,
@@ -38,38 +282,46 @@ class GeminiAPI:
             },
             "safetySettings": Config.SAFETY_SETTINGS
         }
-        
-        try:
-            response = requests.post(url, params=params, json=payload, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            return self._process_response(data)
-                
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        return payload
     
     def _convert_messages_to_gemini_format(self, messages: List[Dict[str, str]], 
-                                         image_data: Optional[str] = None) -> List[Dict]:
-        """Convert messages to Gemini API format."""
+                                         image_data: Optional[Union[bytes, str]] = None,
+                                         images: Optional[List[Dict[str, Any]]] = None) -> List[Dict]:
+        """Convert messages to Gemini API format.
+        
+        ``images`` is a list of ``{"data", "mime_type"}`` dicts attached to the
+        last user message as separate parts; ``image_data`` is a single JPEG.
+        Raw image bytes are base64-encoded here, at request time, so sessions
+        only ever hold the compact encoded image.
+        """
+        images = list(images or [])
+        if image_data:
+            images.insert(0, {"data": image_data, "mime_type": "image/jpeg"})
+        
+        image_parts = []
+        for image in images:
+            data = image['data']
+            if isinstance(data, bytes):
+                data = base64.b64encode(data).decode()
+            image_parts.append({
+                "inline_data": {
+                    "mime_type": image.get('mime_type', "image/jpeg"),
+                    "data": data
+                }
+            })
+        
         contents = []
         
         for msg in messages:
             role = "user" if msg['role'] == 'user' else "model"
             
             # Handle messages with images
-            if image_data and msg['role'] == 'user' and msg == messages[-1]:
+            if image_parts and msg['role'] == 'user' and msg == messages[-1]:
                 contents.append({
                     "role": role,
-                    "parts": [
-                        {"text": msg['content']},
-                        {
-                            "inline_data": {
-                                "mime_type": "image/jpeg",
-                                "data": image_data
-                            }
-                        }
-                    ]
+                    "parts": [{"text": msg['content']}] + image_parts
                 })
             else:
                 contents.append({
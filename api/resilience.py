@@ -0,0 +1,372 @@
+"""Tail-latency hedging and circuit breaking for Gemini calls."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import requests
+from config.settings import Config
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpen(Exception):
+    """Raised when a model's breaker is open and no fallback is available."""
+
+def is_service_failure(error: BaseException) -> bool:
+    """Check whether an error says the service (not the request) is unhealthy."""
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if aiohttp is not None:
+        if isinstance(error, aiohttp.ClientConnectionError):
+            return True
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500 or error.status == 429
+    return False
+
+def is_service_response(error: BaseException) -> bool:
+    """Check whether an error carries an HTTP response from the service."""
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None
+    return aiohttp is not None and isinstance(error, aiohttp.ClientResponseError)
+
+class LatencyWindow:
+    """Rolling window of recent latencies and outcomes for one model.
+    
+    Keeps at most ``size`` attempts from the last ``max_age`` seconds, so a
+    model that no longer gets traffic is not judged by old failures forever.
+    """
+    
+    def __init__(self, size: int = None, max_age: float = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an empty window."""
+        size = size or Config.LATENCY_WINDOW
+        self.max_age = max_age or Config.LATENCY_WINDOW_SECONDS
+        self.clock = clock
+        self.latencies: Deque[Tuple[float, float]] = deque(maxlen=size)
+        self.outcomes: Deque[Tuple[float, bool]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+    
+    def record(self, latency: Optional[float], success: bool) -> None:
+        """Record one attempt; failed attempts carry no latency sample."""
+        now = self.clock()
+        with self._lock:
+            if latency is not None:
+                self.latencies.append((now, latency))
+            self.outcomes.append((now, success))
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the ``q`` quantile of recent latencies, or None without samples."""
+        with self._lock:
+            self._expire_locked()
+            samples = sorted(latency for _, latency in self.latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+    
+    def error_rate(self) -> float:
+        """Share of recent attempts that failed."""
+        with self._lock:
+            self._expire_locked()
+            outcomes = [success for _, success in self.outcomes]
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+    
+    def attempts(self) -> int:
+        """Number of recent attempts, failed ones included."""
+        with self._lock:
+            self._expire_locked()
+            return len(self.outcomes)
+    
+    def _expire_locked(self) -> None:
+        """Drop samples older than ``max_age``."""
+        cutoff = self.clock() - self.max_age
+        for samples in (self.latencies, self.outcomes):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+    
+    def __len__(self) -> int:
+        """Number of latency samples in the window."""
+        with self._lock:
+            self._expire_locked()
+            return len(self.latencies)
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a half-open probe after ``reset_timeout``."""
+    
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize a closed breaker."""
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or Config.CIRCUIT_RESET_TIMEOUT
+        self.clock = clock
+        
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Check whether a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and (not self._probing or
+                                            self.clock() - self._probe_started >= self.reset_timeout):
+                # Let one probe through (again, if the last one never reported back)
+                self._probing = True
+                self._probe_started = self.clock()
+                return True
+            return False
+    
+    def is_open(self) -> bool:
+        """Check whether the breaker is open and not yet due for a probe."""
+        with self._lock:
+            return self.state == OPEN and self.clock() - self.opened_at < self.reset_timeout
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold or on a failed probe."""
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self._probing = False
+
+class Resilience:
+    """Per-model latency tracking, hedging and circuit breakers.
+    
+    Hedging is opt-in: once a model has enough samples, a request still
+    running after the observed p95 gets a duplicate, and whichever answers
+    first wins. A blocking ``requests`` call cannot be interrupted, so the
+    loser is abandoned and its result discarded.
+    
+    Streams are hedged on time to first chunk, which is tracked in a
+    separate window per model; the model's main window keeps full response
+    times for routing.
+    """
+    
+    def __init__(self, hedge: bool = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the registry."""
+        self.hedge_enabled = Config.HEDGE_REQUESTS if hedge is None else hedge
+        self.clock = clock
+        self.windows: Dict[str, LatencyWindow] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.first_chunk_windows: Dict[str, LatencyWindow] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.fast_failures = 0
+    
+    def window(self, model: str) -> LatencyWindow:
+        """Return the latency window for ``model``."""
+        with self._lock:
+            if model not in self.windows:
+                self.windows[model] = LatencyWindow(clock=self.clock)
+            return self.windows[model]
+    
+    def first_chunk_window(self, model: str) -> LatencyWindow:
+        """Return the time-to-first-chunk window for ``model``'s streams."""
+        with self._lock:
+            if model not in self.first_chunk_windows:
+                self.first_chunk_windows[model] = LatencyWindow(clock=self.clock)
+            return self.first_chunk_windows[model]
+    
+    def breaker(self, model: str) -> CircuitBreaker:
+        """Return the circuit breaker for ``model``."""
+        with self._lock:
+            if model not in self.breakers:
+                self.breakers[model] = CircuitBreaker(clock=self.clock)
+            return self.breakers[model]
+    
+    def route(self, model: str, allow_fallback: bool = True) -> str:
+        """Return the model to call, falling back if ``model``'s breaker is open.
+        
+        Raises ``CircuitOpen`` when neither the model nor the fallback is available.
+        """
+        if not Config.CIRCUIT_BREAKER_ENABLED or self.breaker(model).allow():
+            return model
+        
+        fallback = Config.FALLBACK_MODEL
+        if allow_fallback and fallback and fallback != model and self.breaker(fallback).allow():
+            self.fallbacks += 1
+            return fallback
+        
+        self.fast_failures += 1
+        raise CircuitOpen("Gemini is temporarily unavailable. Please try again in a moment.")
+    
+    def record(self, model: str, latency: Optional[float], error: Optional[BaseException] = None,
+               window: Optional[LatencyWindow] = None) -> None:
+        """Feed one attempt's outcome to a latency window and ``model``'s breaker."""
+        window = self.window(model) if window is None else window
+        breaker = self.breaker(model)
+        if error is None:
+            window.record(latency, True)
+            breaker.record_success()
+            return
+        
+        if is_service_failure(error):
+            window.record(None, False)
+            breaker.record_failure()
+        elif is_service_response(error):
+            # The service answered, it just rejected this request
+            window.record(None, True)
+            breaker.record_success()
+        # Anything else (scheduler rejections, local errors) says nothing
+        # about the service, so a half-open breaker keeps waiting for a probe
+    
+    def hedge_delay(self, model: str, window: Optional[LatencyWindow] = None) -> Optional[float]:
+        """Return how long to wait before hedging, or None if hedging is off."""
+        window = self.window(model) if window is None else window
+        if not self.hedge_enabled or len(window) < Config.HEDGE_MIN_SAMPLES:
+            return None
+        return max(Config.HEDGE_MIN_DELAY, window.quantile(Config.HEDGE_PERCENTILE))
+    
+    def call(self, model: str, send: Callable[[], Any],
+             can_hedge: Callable[[], bool] = lambda: True,
+             window: Optional[LatencyWindow] = None,
+             discard: Optional[Callable[[Any], None]] = None) -> Any:
+        """Run ``send`` for ``model`` with latency tracking, hedging and breaking.
+        
+        ``can_hedge`` is asked before sending a duplicate, so hedges only use
+        spare quota. ``window`` replaces the model's latency window, and
+        ``discard`` releases the losing attempt's result, e.g. an open stream.
+        """
+        self.requests += 1
+        window = self.window(model) if window is None else window
+        
+        def attempt() -> Any:
+            started = self.clock()
+            try:
+                result = send()
+            except Exception as e:
+                self.record(model, None, e, window)
+                raise
+            self.record(model, self.clock() - started, None, window)
+            return result
+        
+        delay = self.hedge_delay(model, window)
+        if delay is None:
+            return attempt()
+        
+        executor = self._get_executor()
+        primary = executor.submit(attempt)
+        try:
+            return primary.result(timeout=delay)
+        except FutureTimeout:
+            pass
+        
+        if not can_hedge():
+            return primary.result()
+        
+        self.hedges += 1
+        hedge = executor.submit(attempt)
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        
+        first = primary if primary in done else hedge
+        second = hedge if first is primary else primary
+        winner = first if first.exception() is None else second
+        if winner is hedge and winner.exception() is None:
+            self.hedge_wins += 1
+        
+        # Not yet started: drop it; already running: its result is ignored
+        loser = second if winner is first else first
+        loser.cancel()
+        if discard is not None:
+            def release(future: Future) -> None:
+                if not future.cancelled() and future.exception() is None:
+                    discard(future.result())
+            loser.add_done_callback(release)
+        return winner.result()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the hedging thread pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=Config.HEDGE_WORKERS,
+                                                    thread_name_prefix="edubot-hedge")
+            return self._executor
+    
+    def model_stats(self, model: str) -> Dict[str, Any]:
+        """Return live latency, error and breaker figures for one model."""
+        window = self.window(model)
+        first_chunk = self.first_chunk_window(model)
+        breaker = self.breaker(model)
+        return {
+            "p50": window.quantile(0.5),
+            "p95": window.quantile(0.95),
+            "first_chunk_p95": first_chunk.quantile(0.95),
+            "first_chunk_samples": len(first_chunk),
+            "error_rate": window.error_rate(),
+            "samples": len(window),
+            "attempts": window.attempts(),
+            "state": breaker.state,
+            "open": breaker.is_open()
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hedge and fallback counters plus per-model breaker state."""
+        with self._lock:
+            models = sorted(set(self.windows) | set(self.breakers))
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "win_rate": self.hedge_wins / self.hedges if self.hedges else 0.0,
+            "fallbacks": self.fallbacks,
+            "fast_failures": self.fast_failures,
+            "models": {model: self.model_stats(model) for model in models}
+        }
+
+_resilience: Optional[Resilience] = None
+_resilience_lock = threading.Lock()
+
+def get_resilience() -> Resilience:
+    """Return the process-wide resilience registry."""
+    global _resilience
+    
+    if _resilience is None:
+        with _resilience_lock:
+            if _resilience is None:
+                _resilience = Resilience()
+    return _resilience
+
+def set_resilience(resilience: Optional[Resilience]) -> None:
+    """Replace the process-wide registry, e.g. with one using a fake clock."""
+    global _resilience
+    
+    with _resilience_lock:
+        _resilience = resilience
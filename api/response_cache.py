@@ -0,0 +1,79 @@
+"""Exact-match cache of Gemini responses keyed on the request payload."""
+
+import hashlib
+import json
+import threading
+from typing import Dict, Any, Optional
+from config.settings import Config
+from utils.cache import LRUCache, SQLiteCache
+
+class ResponseCache:
+    """Two-tier (memory + optional SQLite) cache of successful responses."""
+    
+    def __init__(self, max_entries: int = None, ttl: float = None,
+                 db_path: Optional[str] = None, max_db_bytes: int = None) -> None:
+        """Initialize the cache tiers."""
+        ttl = ttl or Config.RESPONSE_CACHE_TTL
+        self.memory = LRUCache(max_entries=max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES,
+                               ttl=ttl)
+        self.disk = None
+        if db_path:
+            self.disk = SQLiteCache(db_path, ttl=ttl,
+                                    max_bytes=max_db_bytes or Config.RESPONSE_CACHE_MAX_DB_BYTES)
+    
+    @staticmethod
+    def make_key(model: str, payload: Dict[str, Any]) -> str:
+        """Return a stable hash of everything that determines the response."""
+        material = {
+            "model": model,
+            "contents": payload.get("contents"),
+            "generationConfig": payload.get("generationConfig"),
+            "safetySettings": payload.get("safetySettings")
+        }
+        if payload.get("cachedContent"):
+            material["cachedContent"] = payload["cachedContent"]
+        encoded = json.dumps(material, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response, promoting disk hits into memory."""
+        response = self.memory.get(key)
+        if response is not None:
+            return response
+        
+        if self.disk is not None:
+            response = self.disk.get(key)
+            if response is not None:
+                self.memory.set(key, response)
+                return response
+        
+        return None
+    
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response; unsuccessful responses are never cached."""
+        if not response.get("success"):
+            return
+        
+        self.memory.set(key, response)
+        if self.disk is not None:
+            self.disk.set(key, response)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for each tier."""
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache shared by all sessions."""
+    global _response_cache
+    
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(db_path=Config.RESPONSE_CACHE_DB_PATH)
+    return _response_cache
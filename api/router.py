@@ -0,0 +1,176 @@
+"""Per-request model and output-cap selection."""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+from config.settings import Config
+from utils.classifier import MATH_PATTERNS, RuleClassifier
+from api.resilience import Resilience, get_resilience
+
+logger = logging.getLogger(__name__)
+
+# Stricter than the academic filter's code rules, which match "if"/"for" in prose
+reasoning_classifier = RuleClassifier(
+    keywords={"reasoning_keyword": Config.ROUTER_REASONING_KEYWORDS},
+    patterns=dict(
+        MATH_PATTERNS,
+        code_block=(r'(?m)```|\bdef \w+\(|\bclass \w+[:(]|^\s*(?:import|from) \w+'
+                    r'|\w+\([^)]*\)\s*\{')
+    )
+)
+
+class RouteDecision(NamedTuple):
+    """Model choice for one request and why it was made."""
+    route: str
+    model: str
+    max_tokens: int
+    reason: str
+    features: Dict[str, Any]
+
+class ModelRouter:
+    """Choose a model and output cap per request from cheap features.
+    
+    Short plain questions go to the ``quick`` route, math, code and
+    multi-step questions to ``reasoning``, everything else to ``standard``
+    (see ``Config.ROUTER_ROUTES``). If the chosen model is degraded (open
+    breaker, high error rate or p95 above its limit) traffic shifts to its
+    alternate in ``Config.ROUTER_ALTERNATES``. The shift ends once the
+    breaker is due for a probe and the failures age out of the window.
+    
+    Decisions are logged through ``logging`` and, when ``log_path`` is set,
+    appended with their outcome to a JSONL file for offline analysis.
+    """
+    
+    def __init__(self, resilience: Optional[Resilience] = None,
+                 log_path: Optional[str] = None) -> None:
+        """Initialize the router."""
+        self.resilience = resilience or get_resilience()
+        self.log_path = log_path if log_path is not None else Config.ROUTER_LOG_PATH
+        self._log_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.shifted = 0
+    
+    @staticmethod
+    def features(user_input: str, images: int = 0, documents: int = 0) -> Dict[str, Any]:
+        """Extract the routing features of a request."""
+        classification = reasoning_classifier.classify(user_input)
+        return {
+            "chars": len(user_input),
+            "rule": classification.rule,
+            "images": images,
+            "documents": documents
+        }
+    
+    def route(self, user_input: str, images: int = 0, documents: int = 0,
+              pinned_model: Optional[str] = None) -> RouteDecision:
+        """Pick the route, model and output cap for a request.
+        
+        ``pinned_model`` (e.g. the model a context cache entry was created
+        for) cannot be changed, so only the output cap is routed.
+        """
+        features = self.features(user_input, images, documents)
+        
+        if features['rule'] or features['chars'] > Config.ROUTER_LONG_INPUT_CHARS:
+            route = "reasoning"
+            reason = features['rule'] or "long_input"
+        elif images or documents:
+            route = "standard"
+            reason = "attachments"
+        elif features['chars'] <= Config.ROUTER_QUICK_MAX_CHARS:
+            route = "quick"
+            reason = "short_plain_question"
+        else:
+            route = "standard"
+            reason = "default"
+        
+        settings = Config.ROUTER_ROUTES[route]
+        model = settings['model']
+        
+        if pinned_model is not None:
+            model = pinned_model
+            reason += ",pinned"
+        elif self._degraded(model):
+            alternate = Config.ROUTER_ALTERNATES.get(model)
+            if alternate and not self._degraded(alternate):
+                model = alternate
+                reason += ",shifted_from_degraded"
+                with self._lock:
+                    self.shifted += 1
+        
+        decision = RouteDecision(route, model, settings['max_tokens'], reason, features)
+        with self._lock:
+            self.counts[route] = self.counts.get(route, 0) + 1
+        logger.info("route=%s model=%s max_tokens=%d reason=%s chars=%d images=%d documents=%d",
+                    route, model, decision.max_tokens, reason, features['chars'],
+                    images, documents)
+        return decision
+    
+    def _degraded(self, model: str) -> bool:
+        """Check live stats for an open breaker, high error rate or slow p95."""
+        stats = self.resilience.model_stats(model)
+        # Past its reset timeout the breaker lets a probe through, so the
+        # model is eligible again
+        if stats['open']:
+            return True
+        if (stats['attempts'] >= Config.ROUTER_MIN_SAMPLES
+                and stats['error_rate'] > Config.ROUTER_MAX_ERROR_RATE):
+            return True
+        
+        # Full stream times grow with the answer, so streamed turns are
+        # judged by time to first chunk
+        if Config.STREAM_RESPONSES:
+            limit = Config.ROUTER_FIRST_CHUNK_P95_LIMITS.get(model)
+            p95, samples = stats['first_chunk_p95'], stats['first_chunk_samples']
+        else:
+            limit = Config.ROUTER_P95_LIMITS.get(model)
+            p95, samples = stats['p95'], stats['samples']
+        return limit is not None and samples >= Config.ROUTER_MIN_SAMPLES and p95 > limit
+    
+    def record(self, decision: RouteDecision, response: Dict[str, Any], latency: float) -> None:
+        """Log the outcome of a routed request, appending it to the JSONL log if enabled."""
+        usage = response.get('usage') or {}
+        entry = {
+            "time": time.time(),
+            "route": decision.route,
+            "model": response.get('model', decision.model),
+            "max_tokens": decision.max_tokens,
+            "reason": decision.reason,
+            "features": decision.features,
+            "success": bool(response.get('success')),
+            "cached": bool(response.get('cached')),
+            "latency": round(latency, 3),
+            "prompt_tokens": usage.get('promptTokenCount'),
+            "output_tokens": usage.get('candidatesTokenCount')
+        }
+        logger.info("route=%s model=%s success=%s latency=%.2fs output_tokens=%s",
+                    entry['route'], entry['model'], entry['success'], latency,
+                    entry['output_tokens'])
+        
+        if not self.log_path:
+            return
+        try:
+            with self._log_lock, open(self.log_path, "a", encoding="utf-8") as log_file:
+                log_file.write(json.dumps(entry) + "\n")
+        except OSError:
+            logger.warning("Could not write routing log to %s", self.log_path, exc_info=True)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return request counts per route and how often traffic was shifted."""
+        with self._lock:
+            return {"routes": dict(self.counts), "shifted": self.shifted}
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+def get_router() -> ModelRouter:
+    """Return the process-wide model router."""
+    global _router
+    
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = ModelRouter()
+    return _router
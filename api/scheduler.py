@@ -0,0 +1,256 @@
+"""Process-wide admission control for Gemini requests."""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional
+from config.settings import Config
+from utils.helpers import estimate_tokens
+from utils.ratelimit import TokenBucket
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# Gemini bills a fixed number of tokens per inline image
+IMAGE_TOKENS = 258
+
+class SchedulerBusy(Exception):
+    """Raised when a request cannot be queued or waited too long for a slot."""
+
+def estimate_payload_tokens(payload: Dict[str, Any]) -> int:
+    """Estimate the input tokens of a ``generateContent`` payload."""
+    tokens = 0
+    for content in payload.get('contents', []):
+        for part in content.get('parts', []):
+            if 'text' in part:
+                tokens += estimate_tokens(part['text'])
+            elif 'inline_data' in part:
+                tokens += IMAGE_TOKENS
+    return tokens
+
+class RequestScheduler:
+    """Shared queue in front of the Gemini API.
+    
+    Requests are admitted when both the requests-per-minute and the
+    tokens-per-minute buckets allow it. Waiting requests are queued per
+    session and served round-robin, interactive turns before background
+    work, so one session's burst cannot starve the others. Identical
+    payloads already in flight are coalesced into one call.
+    
+    With ``start_thread=False`` nothing runs in the background and tests
+    drive admission by calling ``dispatch`` with a fake ``clock``.
+    """
+    
+    def __init__(self, requests_per_minute: int = None, tokens_per_minute: int = None,
+                 max_queue: int = None, max_wait: float = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 start_thread: bool = True) -> None:
+        """Initialize the scheduler."""
+        rpm = requests_per_minute or Config.GEMINI_REQUESTS_PER_MINUTE
+        tpm = tokens_per_minute or Config.GEMINI_TOKENS_PER_MINUTE
+        burst = Config.SCHEDULER_BURST_SECONDS / 60.0
+        
+        self.request_bucket = TokenBucket(rpm / 60.0, max(1.0, rpm * burst), clock=clock)
+        self.token_bucket = TokenBucket(tpm / 60.0, max(1.0, tpm * burst), clock=clock)
+        self.max_queue = max_queue or Config.SCHEDULER_MAX_QUEUE
+        self.max_wait = Config.SCHEDULER_MAX_WAIT if max_wait is None else max_wait
+        self.clock = clock
+        
+        self._queues: List["OrderedDict[str, Deque[Dict[str, Any]]]"] = [
+            OrderedDict() for _ in (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+        ]
+        self._depth = 0
+        self._inflight: Dict[str, Future] = {}
+        self._condition = threading.Condition()
+        self._start_thread = start_thread
+        self._thread: Optional[threading.Thread] = None
+        
+        self.admitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.expired = 0
+        self.max_depth = 0
+        self.waits: Deque[float] = deque(maxlen=Config.SCHEDULER_STATS_WINDOW)
+    
+    def reserve(self, session_id: str, tokens: int,
+                priority: int = PRIORITY_INTERACTIVE) -> Future:
+        """Queue a request and return a future that resolves once it may be sent.
+        
+        Raises ``SchedulerBusy`` immediately if the queue is full.
+        """
+        ticket: Future = Future()
+        with self._condition:
+            if self._depth >= self.max_queue:
+                self.rejected += 1
+                raise SchedulerBusy("EduBot is very busy right now. Please try again in a moment.")
+            
+            queue = self._queues[priority].setdefault(session_id, deque())
+            queue.append({"future": ticket, "tokens": tokens, "enqueued": self.clock()})
+            self._depth += 1
+            self.max_depth = max(self.max_depth, self._depth)
+            
+            self._ensure_thread()
+            self._condition.notify()
+        return ticket
+    
+    def try_admit(self, tokens: int) -> bool:
+        """Take a slot immediately if nobody is queued and the buckets allow it.
+        
+        Used for optional extra requests (such as hedges) that should only
+        spend spare quota and never wait.
+        """
+        with self._condition:
+            if self._depth:
+                return False
+            if (self.request_bucket.time_until_available(1) > 0
+                    or self.token_bucket.time_until_available(tokens) > 0):
+                return False
+            
+            self.request_bucket.try_acquire(1)
+            self.token_bucket.try_acquire(tokens)
+            self.admitted += 1
+            return True
+    
+    def run(self, session_id: str, tokens: int, call: Callable[[], Any],
+            key: Optional[str] = None, priority: int = PRIORITY_INTERACTIVE) -> Any:
+        """Wait for admission, then run ``call``.
+        
+        Concurrent calls with the same ``key`` share the first caller's result
+        without using another slot.
+        """
+        if key is not None:
+            with self._condition:
+                shared = self._inflight.get(key)
+                if shared is None:
+                    shared = self._inflight[key] = Future()
+                    leader = True
+                else:
+                    self.coalesced += 1
+                    leader = False
+            if not leader:
+                return shared.result()
+        
+        try:
+            self.reserve(session_id, tokens, priority).result()
+            result = call()
+        except BaseException as e:
+            if key is not None:
+                shared.set_exception(e)
+            raise
+        else:
+            if key is not None:
+                shared.set_result(result)
+            return result
+        finally:
+            if key is not None:
+                with self._condition:
+                    self._inflight.pop(key, None)
+    
+    def dispatch(self) -> Optional[float]:
+        """Admit every queued request the buckets allow right now.
+        
+        Returns the seconds until the next request could be admitted, or
+        None when the queue is empty.
+        """
+        with self._condition:
+            return self._dispatch_locked()
+    
+    def _dispatch_locked(self) -> Optional[float]:
+        """Admit requests in fairness order; the caller holds the condition."""
+        now = self.clock()
+        self._expire_locked(now)
+        
+        while self._depth:
+            queues = next(q for q in self._queues if q)
+            session_id, queue = next(iter(queues.items()))
+            job = queue[0]
+            
+            delay = max(self.request_bucket.time_until_available(1),
+                        self.token_bucket.time_until_available(job['tokens']))
+            if delay > 0:
+                return delay
+            
+            self.request_bucket.try_acquire(1)
+            self.token_bucket.try_acquire(job['tokens'])
+            
+            queue.popleft()
+            if queue:
+                queues.move_to_end(session_id)
+            else:
+                del queues[session_id]
+            self._depth -= 1
+            
+            self.admitted += 1
+            self.waits.append(now - job['enqueued'])
+            job['future'].set_result(None)
+        
+        return None
+    
+    def _expire_locked(self, now: float) -> None:
+        """Fail requests that have waited longer than ``max_wait``."""
+        for queues in self._queues:
+            for session_id in list(queues):
+                queue = queues[session_id]
+                while queue and now - queue[0]['enqueued'] > self.max_wait:
+                    job = queue.popleft()
+                    self._depth -= 1
+                    self.expired += 1
+                    job['future'].set_exception(
+                        SchedulerBusy("Timed out waiting for the Gemini rate limit. Please try again.")
+                    )
+                if not queue:
+                    del queues[session_id]
+    
+    def _ensure_thread(self) -> None:
+        """Start the admission thread on first use."""
+        if not self._start_thread or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="edubot-scheduler", daemon=True)
+        self._thread.start()
+    
+    def _loop(self) -> None:
+        """Admit requests as bucket tokens become available."""
+        with self._condition:
+            while True:
+                delay = self._dispatch_locked()
+                if delay is not None:
+                    # Wake up in time for the oldest request to expire as well
+                    delay = min(delay, self.max_wait)
+                self._condition.wait(timeout=delay)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait-time and admission counters."""
+        with self._condition:
+            waits = sorted(self.waits)
+            depth = self._depth
+        return {
+            "queue_depth": depth,
+            "max_queue_depth": self.max_depth,
+            "admitted": self.admitted,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+            "p95_wait": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0
+        }
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> RequestScheduler:
+    """Return the scheduler shared by every session in the process."""
+    global _scheduler
+    
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = RequestScheduler()
+    return _scheduler
+
+def set_scheduler(scheduler: Optional[RequestScheduler]) -> None:
+    """Replace the process-wide scheduler, e.g. with one using a fake clock."""
+    global _scheduler
+    
+    with _scheduler_lock:
+        _scheduler = scheduler
@@ -0,0 +1,82 @@
+"""Benchmark the academic question classifier: per-keyword scans vs. one compiled pass.
+
+Usage: python benchmarks/bench_classifier.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import Config
+from utils.classifier import academic_classifier
+
+SAMPLES = [
+    "Can you explain the difference between mitosis and meiosis?",
+    "What is the derivative of sin(x) * x^2",
+    "how do I fix this: for i in range(10) print(i)",
+    "Tell me a joke about cats and dogs that is really funny",
+    "who won the football game last night between the two big teams",
+    "I need help with my chemistry homework on stoichiometry",
+    "recommend a good restaurant near the station for dinner tonight",
+    "solve 3x + 5 = 20",
+    "hey",
+    "What were the main causes of the French Revolution and its effects",
+]
+
+def baseline(question: str) -> bool:
+    """The original linear keyword scan followed by uncompiled regex searches."""
+    question_lower = question.lower()
+    for keyword in Config.ACADEMIC_KEYWORDS:
+        if keyword in question_lower:
+            return True
+    math_patterns = [
+        r'\d+\s*[\+\-\*\/\=]\s*\d+',
+        r'[xy]\s*[\+\-\*\/\=]',
+        r'\b(sin|cos|tan|log|ln)\b'
+    ]
+    for pattern in math_patterns:
+        if re.search(pattern, question_lower):
+            return True
+    code_patterns = [
+        r'\b(print|return|if|else|for|while|function|def|class|import)\b',
+        r'[\{\}\[\]\(\);]'
+    ]
+    for pattern in code_patterns:
+        if re.search(pattern, question_lower):
+            return True
+    if len(question.strip()) < 10:
+        return True
+    return False
+
+def make_messages(count: int) -> list:
+    rng = random.Random(0)
+    return [rng.choice(SAMPLES) + f" #{rng.randrange(10**6)}" * rng.randrange(2)
+            for _ in range(count)]
+
+def main() -> None:
+    for count in (1_000, 100_000):
+        messages = make_messages(count)
+        
+        start = time.perf_counter()
+        expected = [baseline(message) for message in messages]
+        baseline_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        single = [academic_classifier.classify(message).matched for message in messages]
+        single_s = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        batch = [result.matched for result in academic_classifier.classify_batch(messages)]
+        batch_s = time.perf_counter() - start
+        
+        assert expected == single == batch, "classifier disagrees with baseline"
+        print(f"{count:>7} messages: baseline {baseline_s / count * 1e6:6.2f} us/msg, "
+              f"classify {single_s / count * 1e6:6.2f} us/msg, "
+              f"classify_batch {batch_s / count * 1e6:6.2f} us/msg")
+
+if __name__ == "__main__":
+    main()
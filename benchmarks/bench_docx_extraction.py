@@ -0,0 +1,76 @@
+"""Benchmark DOCX extraction: python-docx object model vs. streaming XML parser.
+
+Usage: python benchmarks/bench_docx_extraction.py [pages]
+"""
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from processors.docx_extractor import extract_docx_text
+
+PARAGRAPHS_PER_PAGE = 8
+
+def make_docx(pages: int) -> bytes:
+    """Build a syllabus-like document with prose and a rubric table per page."""
+    document = Document()
+    sentence = ("Students will analyse primary sources and justify each claim "
+                "with evidence drawn from the assigned readings. ")
+    
+    for page in range(pages):
+        document.add_heading(f"Unit {page + 1}", level=1)
+        for paragraph in range(PARAGRAPHS_PER_PAGE):
+            document.add_paragraph(sentence * 3)
+        table = document.add_table(rows=4, cols=3)
+        for row in range(4):
+            for col in range(3):
+                table.cell(row, col).text = f"Criterion {row}.{col}: meets expectations"
+    
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+def baseline(data: bytes) -> str:
+    """The original python-docx paragraphs-only implementation."""
+    doc = Document(io.BytesIO(data))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+def streaming(data: bytes) -> str:
+    return extract_docx_text(io.BytesIO(data))
+
+def measure(func, data: bytes) -> tuple:
+    """Return (seconds, peak traced MB, characters); timing and memory are separate runs."""
+    start = time.perf_counter()
+    text = func(data)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    func(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6, len(text)
+
+def main() -> None:
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    data = make_docx(pages)
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        size_mb = archive.getinfo('word/document.xml').file_size / 1e6
+    print(f"Document: ~{pages} pages, {len(data) / 1e6:.2f} MB zipped, "
+          f"{size_mb:.1f} MB document.xml")
+    
+    for name, func in (("python-docx", baseline), ("streaming XML", streaming)):
+        elapsed, peak, chars = measure(func, data)
+        print(f"{name:>14}: {elapsed:6.2f}s  {size_mb / elapsed:6.1f} MB/s  "
+              f"peak {peak:6.1f} MB  {chars} chars extracted")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark adaptive image encoding vs. the fixed JPEG q85 encoder.
+
+Usage: python benchmarks/bench_image_encoding.py
+"""
+
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageFilter
+from processors.image_encoder import encode_image
+
+SIZE = (1024, 768)
+
+def line_diagram() -> "Image.Image":
+    """Free-body diagram style: thin black lines, arrows and labels on white."""
+    image = Image.new('RGB', SIZE, 'white')
+    draw = ImageDraw.Draw(image)
+    rng = random.Random(1)
+    for _ in range(40):
+        x, y = rng.randrange(SIZE[0]), rng.randrange(SIZE[1])
+        draw.line([(x, y), (x + rng.randrange(-200, 200), y + rng.randrange(-200, 200))],
+                  fill='black', width=2)
+        draw.text((x + 4, y + 4), f"F{rng.randrange(9)} = m*a", fill=(0, 0, 160))
+    draw.rectangle([300, 250, 700, 500], outline=(200, 0, 0), width=4)
+    return image
+
+def bar_chart() -> "Image.Image":
+    """Spreadsheet chart: flat coloured bars, gridlines and axis labels."""
+    image = Image.new('RGB', SIZE, (250, 250, 250))
+    draw = ImageDraw.Draw(image)
+    for y in range(100, 700, 50):
+        draw.line([(80, y), (980, y)], fill=(220, 220, 220))
+        draw.text((20, y - 6), str(700 - y), fill='black')
+    colors = [(66, 133, 244), (219, 68, 55), (244, 180, 0), (15, 157, 88)]
+    for i in range(16):
+        height = 80 + (i * 37) % 500
+        draw.rectangle([100 + i * 55, 700 - height, 140 + i * 55, 700], fill=colors[i % 4])
+    return image
+
+def screenshot() -> "Image.Image":
+    """Slide screenshot: smooth gradient header, text and a resampled logo."""
+    image = Image.new('RGB', SIZE, 'white')
+    header = Image.linear_gradient('L').resize((SIZE[0], 120)).convert('RGB')
+    image.paste(Image.merge('RGB', (header.split()[0], header.split()[0].point(lambda v: v // 2),
+                                    Image.new('L', header.size, 180))), (0, 0))
+    draw = ImageDraw.Draw(image)
+    for line in range(25):
+        draw.text((60, 150 + line * 22), "• Newton's second law relates net force and "
+                  "acceleration: F = ma", fill=(40, 40, 40))
+    logo = Image.effect_noise((64, 64), 60).convert('RGB').resize((160, 160), Image.Resampling.BICUBIC)
+    image.paste(logo, (820, 500))
+    return image
+
+def photo() -> "Image.Image":
+    """Colour photo: per-channel noise, gradients and blur."""
+    channels = [Image.effect_noise(SIZE, 50 + 10 * i) for i in range(3)]
+    noise = Image.merge('RGB', channels)
+    gradient = Image.linear_gradient('L').resize(SIZE).convert('RGB')
+    return Image.blend(noise, gradient, 0.5).filter(ImageFilter.GaussianBlur(1.5))
+
+def notes_photo() -> "Image.Image":
+    """Phone photo of handwritten notes: noisy paper texture with ruled lines."""
+    base = Image.merge('RGB', [Image.effect_noise(SIZE, 20) for _ in range(3)])
+    image = Image.blend(base, Image.new('RGB', SIZE, (236, 232, 220)), 0.7)
+    draw = ImageDraw.Draw(image)
+    for y in range(40, SIZE[1], 28):
+        draw.line([(0, y), (SIZE[0], y)], fill=(120, 140, 200))
+        draw.text((90, y - 14), "d/dx sin(x) = cos(x)", fill=(30, 30, 90))
+    return image.filter(ImageFilter.GaussianBlur(0.8))
+
+def baseline(image: "Image.Image") -> bytes:
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=85)
+    return buffered.getvalue()
+
+def timed(func, *args) -> tuple:
+    func(*args)
+    runs = 5
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = func(*args)
+    return result, (time.perf_counter() - start) / runs * 1000
+
+def main() -> None:
+    corpus = [("line diagram", line_diagram()), ("bar chart", bar_chart()),
+              ("screenshot", screenshot()), ("photo", photo()),
+              ("notes photo", notes_photo())]
+    
+    print(f"{'sample':>13} | {'JPEG q85':>17} | {'adaptive':>28}")
+    totals = [0, 0]
+    for name, image in corpus:
+        jpeg, jpeg_ms = timed(baseline, image)
+        encoded, adaptive_ms = timed(encode_image, image)
+        totals[0] += len(jpeg)
+        totals[1] += len(encoded["data"])
+        print(f"{name:>13} | {len(jpeg) / 1024:7.1f} KB {jpeg_ms:5.1f} ms | "
+              f"{len(encoded['data']) / 1024:7.1f} KB {adaptive_ms:5.1f} ms "
+              f"{encoded['format']:>4} ({encoded['kind']})")
+    print(f"{'total':>13} | {totals[0] / 1024:7.1f} KB          | {totals[1] / 1024:7.1f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark image preprocessing: full decode + reopen for preview vs. single draft decode.
+
+Usage: python benchmarks/bench_image_pipeline.py [megapixels ...]
+"""
+
+import base64
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw, ImageFilter
+from config.settings import Config
+from processors.image_processor import ImageProcessor
+
+class Upload(io.BytesIO):
+    """Minimal stand-in for a Streamlit UploadedFile."""
+    
+    @property
+    def size(self) -> int:
+        return len(self.getvalue())
+
+def make_photo(megapixels: float) -> bytes:
+    """Build a phone-photo-sized JPEG of ruled notes with sensor-like noise."""
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    
+    image = Image.effect_noise((width, height), 24).convert('RGB')
+    image = Image.blend(image, Image.new('RGB', image.size, (236, 232, 220)), 0.8)
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height, max(1, height // 40)):
+        draw.line([(0, y), (width, y)], fill=(120, 140, 200), width=max(1, width // 1500))
+        draw.text((width // 10, y + 4), "dy/dx = 2x + 3  (chain rule)", fill=(20, 20, 60))
+    image = image.filter(ImageFilter.GaussianBlur(1))
+    
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=92)
+    return out.getvalue()
+
+def baseline(data: bytes) -> int:
+    """The original pipeline plus the sidebar's second decode for the preview."""
+    upload = Upload(data)
+    image = Image.open(upload)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    width, height = image.size
+    max_size = Config.MAX_IMAGE_SIZE
+    if width > max_size or height > max_size:
+        ratio = min(max_size/width, max_size/height)
+        image = image.resize((int(width * ratio), int(height * ratio)), Image.Resampling.LANCZOS)
+    buffered = io.BytesIO()
+    image.save(buffered, format="JPEG", quality=85)
+    base64.b64encode(buffered.getvalue()).decode()
+    
+    upload.seek(0)
+    preview = Image.open(upload)
+    preview.load()
+    return width * height * 3 * 2
+
+def single_decode(data: bytes) -> int:
+    upload = Upload(data)
+    result = ImageProcessor.process_image(upload)
+    assert result["success"], result
+    
+    decoded = Image.open(Upload(data))
+    decoded.draft('RGB', result["processed_size"])
+    return decoded.size[0] * decoded.size[1] * 3
+
+def main() -> None:
+    sizes = [float(arg) for arg in sys.argv[1:]] or [12, 48]
+    
+    for megapixels in sizes:
+        data = make_photo(megapixels)
+        print(f"{megapixels:.0f} MP JPEG, {len(data) / 1e6:.1f} MB")
+        for name, func in (("baseline", baseline), ("single decode", single_decode)):
+            func(data)
+            runs = 3
+            start = time.perf_counter()
+            for _ in range(runs):
+                decoded_bytes = func(data)
+            elapsed = (time.perf_counter() - start) / runs
+            print(f"  {name:>14}: {elapsed * 1000:7.0f} ms  "
+                  f"~{decoded_bytes / 1e6:6.0f} MB of decoded pixels")
+
+if __name__ == "__main__":
+    main()
@@ -10,17 +10,188 @@ class Config:
     GEMINI_API_KEY: Optional[str] = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
     GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
     
+    # HTTP Configuration
+    HTTP_POOL_SIZE = 32
+    GEMINI_CONNECT_TIMEOUT = 5
+    GEMINI_READ_TIMEOUT = 30
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_BASE = 0.5
+    RETRY_BACKOFF_MAX = 8.0
+    RETRY_AFTER_MAX = 30.0
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    
+    # Shared Request Scheduler (per-process Gemini quota)
+    SCHEDULER_ENABLED = True
+    GEMINI_REQUESTS_PER_MINUTE = int(os.getenv('EDUBOT_GEMINI_RPM', '60'))
+    GEMINI_TOKENS_PER_MINUTE = int(os.getenv('EDUBOT_GEMINI_TPM', '1000000'))
+    SCHEDULER_BURST_SECONDS = 10
+    SCHEDULER_MAX_QUEUE = 200
+    SCHEDULER_MAX_WAIT = 30.0
+    SCHEDULER_STATS_WINDOW = 500
+    
+    # Tail Latency and Failure Handling
+    # Streams are hedged on time to first chunk, other requests on total latency
+    HEDGE_REQUESTS = os.getenv('EDUBOT_HEDGE_REQUESTS', '0') == '1'
+    HEDGE_PERCENTILE = 0.95
+    HEDGE_MIN_DELAY = 1.0
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_WORKERS = 16
+    LATENCY_WINDOW = 200
+    LATENCY_WINDOW_SECONDS = 300.0
+    CIRCUIT_BREAKER_ENABLED = True
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_RESET_TIMEOUT = 30.0
+    FALLBACK_MODEL: Optional[str] = os.getenv('EDUBOT_FALLBACK_MODEL', 'gemini-1.5-flash-8b')
+    
     # Model Configuration
     DEFAULT_MODEL = "gemini-1.5-flash"
     DEFAULT_MAX_TOKENS = 2000
     DEFAULT_TEMPERATURE = 0.7
+    STREAM_RESPONSES = True
+    BATCH_CONCURRENCY = 8
+    
+    # Gemini Context Caching (cachedContents) for uploaded documents
+    CONTEXT_CACHE_ENABLED = True
+    CONTEXT_CACHE_TTL = 1800
+    CONTEXT_CACHE_REFRESH_MARGIN = 300
+    CONTEXT_CACHE_MIN_TOKENS = 32_768
+    CONTEXT_CACHE_RETRY_AFTER = 300
+    # Caching needs an explicit model version
+    CONTEXT_CACHE_MODELS = {
+        "gemini-1.5-flash": "gemini-1.5-flash-002",
+        "gemini-1.5-pro": "gemini-1.5-pro-002"
+    }
+    
+    # Conversation History
+    HISTORY_TOKEN_BUDGET = 4000
+    HISTORY_SUMMARY_TOKENS = 300
+    HISTORY_SUMMARY_MIN_MESSAGES = 4
+    HISTORY_SUMMARY_MESSAGE_CHARS = 2000
+    HISTORY_SUMMARY_WORKERS = 2
+    HISTORY_STATS_TURNS = 50
+    
+    # Long-document Summarization (map-reduce over sections)
+    SUMMARY_KEYWORDS = [
+        'summarize', 'summarise', 'summary', 'summaries', 'chapter by chapter',
+        'each chapter', 'every chapter', 'overview', 'outline', 'main points',
+        'key points', 'tl;dr', 'recap'
+    ]
+    SUMMARY_SECTION_CHARS = 24_000
+    SUMMARY_MAX_SECTIONS = 64
+    SUMMARY_CONCURRENCY = 8
+    SUMMARY_MAP_MODEL = "gemini-1.5-flash"
+    SUMMARY_MAP_MAX_TOKENS = 600
+    SUMMARY_REDUCE_TOKEN_BUDGET = 12_000
+    SUMMARY_REDUCE_MAX_TOKENS = 4096
+    
+    # Model Routing
+    ROUTER_ENABLED = True
+    ROUTER_ROUTES = {
+        "quick": {"model": "gemini-1.5-flash-8b", "max_tokens": 800},
+        "standard": {"model": "gemini-1.5-flash", "max_tokens": 2000},
+        "reasoning": {"model": "gemini-1.5-pro", "max_tokens": 4096}
+    }
+    ROUTER_ALTERNATES = {
+        "gemini-1.5-flash-8b": "gemini-1.5-flash",
+        "gemini-1.5-flash": "gemini-1.5-pro",
+        "gemini-1.5-pro": "gemini-1.5-flash"
+    }
+    # Full response time, used when STREAM_RESPONSES is off
+    ROUTER_P95_LIMITS = {
+        "gemini-1.5-flash-8b": 8.0,
+        "gemini-1.5-flash": 12.0,
+        "gemini-1.5-pro": 25.0
+    }
+    # Time to first chunk, used for streamed turns
+    ROUTER_FIRST_CHUNK_P95_LIMITS = {
+        "gemini-1.5-flash-8b": 2.0,
+        "gemini-1.5-flash": 3.0,
+        "gemini-1.5-pro": 6.0
+    }
+    ROUTER_QUICK_MAX_CHARS = 160
+    ROUTER_LONG_INPUT_CHARS = 800
+    ROUTER_MIN_SAMPLES = 10
+    ROUTER_MAX_ERROR_RATE = 0.25
+    ROUTER_LOG_PATH: Optional[str] = os.getenv('EDUBOT_ROUTER_LOG')
+    ROUTER_REASONING_KEYWORDS = [
+        'prove', 'proof', 'derive', 'derivation', 'step by step', 'step-by-step',
+        'integral', 'integrate', 'derivative', 'differentiate', 'theorem', 'solve',
+        'equation', 'algorithm', 'complexity', 'debug', 'optimize', 'compare and contrast'
+    ]
+    
+    # Response Cache
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_MAX_ENTRIES = 1000
+    RESPONSE_CACHE_TTL = 3600
+    RESPONSE_CACHE_DB_PATH: Optional[str] = os.getenv('EDUBOT_RESPONSE_CACHE_DB')
+    RESPONSE_CACHE_MAX_DB_BYTES = 256 * 1024 * 1024
+    
+    # Near-duplicate Answer Cache
+    ANSWER_CACHE_ENABLED = True
+    # Word-level Jaccard similarity a cached question must reach; 1.0 = same content words
+    ANSWER_CACHE_THRESHOLD = 1.0
+    ANSWER_CACHE_MAX_ENTRIES = 100_000
+    ANSWER_CACHE_MIN_CHARS = 8
     
     # File Processing
     MAX_IMAGE_SIZE = 1024
+    IMAGE_PREVIEW_SIZE = 200
+    IMAGE_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+    UPLOAD_WORKERS = 4
+    UPLOAD_POLL_INTERVAL = 1.0
+    IMAGE_TARGET_BYTES = 80 * 1024
+    IMAGE_MAX_QUALITY = 85
+    IMAGE_MIN_QUALITY = 50
+    IMAGE_WEBP_METHOD = 2
+    MAX_IMAGES_PER_REQUEST = 10
+    MAX_IMAGE_BYTES_PER_REQUEST = 14 * 1024 * 1024
     MAX_DOCUMENT_PREVIEW = 2000
+    PDF_MAX_WORKERS = min(4, os.cpu_count() or 1)
+    PDF_PAGES_PER_TASK = 16
+    PDF_PARALLEL_MIN_PAGES = 32
+    PDF_MAX_PAGES = 2000
+    PDF_TIME_BUDGET = 60.0
+    
+    # Streaming Table Summaries
+    CSV_STREAMING_THRESHOLD = 20 * 1024 * 1024
+    CSV_CHUNK_ROWS = 50_000
+    EXCEL_CHUNK_ROWS = 10_000
+    STREAMING_SAMPLE_ROWS = 10
+    STREAMING_QUANTILE_SAMPLE = 10_000
+    STREAMING_TOP_K = 20
+    
+    # Processed Document Cache
+    DOCUMENT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+    DOCUMENT_CACHE_DB_PATH: Optional[str] = os.getenv('EDUBOT_DOCUMENT_CACHE_DB')
+    DOCUMENT_CACHE_MAX_DB_BYTES = 2 * 1024 * 1024 * 1024
+    
+    # Document Retrieval
+    DOCUMENT_CHUNK_SIZE = 1200
+    DOCUMENT_CHUNK_OVERLAP = 150
+    RETRIEVAL_TOP_K = 8
+    DOCUMENT_CONTEXT_TOKEN_BUDGET = 3000
     
     # Search Configuration
     MAX_SEARCH_RESULTS = 3
+    WEB_SEARCH_KEYWORDS = ['current', 'latest', 'recent', 'today', 'news', '2024', '2025']
+    WEB_SEARCH_CACHE_TTL = 600
+    WEB_SEARCH_CACHE_MAX_ENTRIES = 1000
+    WEB_SEARCH_LATENCY_BUDGET = 4.0
+    WEB_SEARCH_RATE_PER_MINUTE = 30
+    WEB_SEARCH_RATE_BURST = 5
+    WEB_SEARCH_WORKERS = 4
+    
+    # Search Result Page Fetching
+    WEB_FETCH_PAGES = True
+    WEB_FETCH_TOP_K = 3
+    WEB_FETCH_DEADLINE = 6.0
+    WEB_FETCH_MAX_BYTES = 512 * 1024
+    WEB_FETCH_FAILURE_TTL = 120
+    WEB_FETCH_WORKERS = 8
+    WEB_FETCH_USER_AGENT = "Mozilla/5.0 (compatible; EduBot/1.0)"
+    WEB_PAGE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    WEB_PASSAGE_CHARS = 600
+    WEB_PASSAGES_PER_PAGE = 2
     
     # Academic Keywords
     ACADEMIC_KEYWORDS = [
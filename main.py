@@ -32,6 +32,7 @@ def display_header() -> None:
             if st.button("🗑️ Clear Chat"):
                 st.session_state.conversation_history = []
                 st.session_state.total_tokens = 0
+                st.session_state.history_manager.reset()
                 st.rerun()
         else:
             st.error("🔴 No API Key Found")
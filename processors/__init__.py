@@ -3,5 +3,6 @@
 from .document_processor import DocumentProcessor
 from .image_processor import ImageProcessor
 from .web_searcher import WebSearcher
+from .document_index import DocumentIndex
 
-__all__ = ['DocumentProcessor', 'ImageProcessor', 'WebSearcher']
\ No newline at end of file
+__all__ = ['DocumentProcessor', 'ImageProcessor', 'WebSearcher', 'DocumentIndex']
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""Process-wide, content-addressed cache of processed documents."""
+
+import hashlib
+import sys
+import threading
+from typing import Any, Dict, Optional
+from config.settings import Config
+from utils.cache import LRUCache, SQLiteCache
+
+def content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest identifying a file's contents."""
+    return hashlib.sha256(data).hexdigest()
+
+def _approximate_size(value: Any) -> int:
+    """Estimate the memory held by a cached artifact."""
+    if hasattr(value, 'nbytes') and callable(value.nbytes):
+        return value.nbytes()
+    return sys.getsizeof(value)
+
+class DocumentCache:
+    """Cache extracted text and derived artifacts keyed by file content.
+    
+    Keys combine the artifact kind, file type, processor version and the
+    SHA-256 of the uploaded bytes, so identical uploads from different
+    sessions (or under different names) are parsed once, and a processor
+    upgrade never serves stale output.
+    """
+    
+    def __init__(self, max_bytes: int = None, db_path: Optional[str] = None,
+                 max_db_bytes: int = None) -> None:
+        """Initialize the cache tiers."""
+        self.memory = LRUCache(max_entries=sys.maxsize,
+                               max_bytes=max_bytes or Config.DOCUMENT_CACHE_MAX_BYTES,
+                               sizeof=_approximate_size)
+        self.disk = None
+        if db_path:
+            self.disk = SQLiteCache(db_path,
+                                    max_bytes=max_db_bytes or Config.DOCUMENT_CACHE_MAX_DB_BYTES)
+    
+    @staticmethod
+    def make_key(digest: str, file_type: str, version: str, kind: str = "text") -> str:
+        """Build the cache key for one artifact of a file."""
+        return f"{kind}:{file_type}:{version}:{digest}"
+    
+    def get(self, key: str) -> Any:
+        """Return a cached artifact, promoting disk hits into memory."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+                return value
+        
+        return None
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store an artifact in every tier."""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for each tier."""
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+_document_cache: Optional[DocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+def get_document_cache() -> DocumentCache:
+    """Return the process-wide document cache shared by all sessions."""
+    global _document_cache
+    
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                _document_cache = DocumentCache(db_path=Config.DOCUMENT_CACHE_DB_PATH)
+    return _document_cache
@@ -0,0 +1,133 @@
+"""Chunked BM25 retrieval over extracted document text."""
+
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple
+from config.settings import Config
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from', 'has',
+    'have', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this',
+    'to', 'was', 'were', 'will', 'with', 'what', 'which', 'who', 'how', 'why',
+    'does', 'do', 'can', 'could', 'please', 'explain', 'me', 'about', 'i', 'you'
+])
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase index terms, dropping stopwords."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+class DocumentIndex:
+    """BM25 inverted index over overlapping chunks of a single document.
+    
+    Chunks are stored as character offsets into the original text, and each
+    term's postings are packed into parallel ``array`` buffers of chunk ids
+    and term frequencies, so the index stays small next to the text itself.
+    """
+    
+    K1 = 1.5
+    B = 0.75
+    
+    def __init__(self, text: str, chunk_size: int = None, overlap: int = None) -> None:
+        """Split ``text`` into chunks and build the inverted index."""
+        self.text = text
+        self.chunk_size = chunk_size or Config.DOCUMENT_CHUNK_SIZE
+        self.overlap = overlap if overlap is not None else Config.DOCUMENT_CHUNK_OVERLAP
+        
+        self.starts = array('I')
+        self.ends = array('I')
+        self.lengths = array('I')
+        self.terms: Dict[str, int] = {}
+        self.postings_ids: List[array] = []
+        self.postings_tfs: List[array] = []
+        
+        self._build()
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+    
+    def _chunk_bounds(self) -> List[Tuple[int, int]]:
+        """Return ``(start, end)`` offsets, preferring paragraph/sentence breaks."""
+        text = self.text
+        size = self.chunk_size
+        bounds = []
+        start = 0
+        
+        while start < len(text):
+            end = min(start + size, len(text))
+            if end < len(text):
+                floor = start + int(size * 0.7)
+                for separator in ("\n\n", "\n", ". "):
+                    cut = text.rfind(separator, floor, end)
+                    if cut != -1:
+                        end = cut + len(separator)
+                        break
+            
+            bounds.append((start, end))
+            if end >= len(text):
+                break
+            
+            next_start = max(end - self.overlap, start + 1)
+            space = text.find(" ", next_start, end)
+            start = space + 1 if space != -1 else next_start
+        
+        return bounds
+    
+    def _build(self) -> None:
+        """Tokenize every chunk and append it to the postings lists."""
+        for chunk_id, (start, end) in enumerate(self._chunk_bounds()):
+            tokens = tokenize(self.text[start:end])
+            self.starts.append(start)
+            self.ends.append(end)
+            self.lengths.append(len(tokens))
+            
+            for term, tf in Counter(tokens).items():
+                term_id = self.terms.get(term)
+                if term_id is None:
+                    term_id = len(self.terms)
+                    self.terms[term] = term_id
+                    self.postings_ids.append(array('I'))
+                    self.postings_tfs.append(array('H'))
+                self.postings_ids[term_id].append(chunk_id)
+                self.postings_tfs[term_id].append(min(tf, 65535))
+    
+    def nbytes(self) -> int:
+        """Approximate memory held by the index, excluding the shared text."""
+        arrays = [self.starts, self.ends, self.lengths] + self.postings_ids + self.postings_tfs
+        postings = sum(len(a) * a.itemsize + 64 for a in arrays)
+        return postings + sum(len(term) + 100 for term in self.terms)
+    
+    @property
+    def num_chunks(self) -> int:
+        """Number of chunks in the index."""
+        return len(self.starts)
+    
+    def chunk(self, chunk_id: int) -> str:
+        """Return the text of a chunk."""
+        return self.text[self.starts[chunk_id]:self.ends[chunk_id]]
+    
+    def search(self, query: str, top_k: int = None) -> List[Tuple[int, float]]:
+        """Return ``(chunk_id, score)`` pairs for the best matching chunks."""
+        top_k = top_k or Config.RETRIEVAL_TOP_K
+        n = self.num_chunks
+        if not n:
+            return []
+        
+        scores: Dict[int, float] = {}
+        k1, b, avg_length = self.K1, self.B, self.avg_length or 1.0
+        
+        for term in set(tokenize(query)):
+            term_id = self.terms.get(term)
+            if term_id is None:
+                continue
+            
+            ids = self.postings_ids[term_id]
+            tfs = self.postings_tfs[term_id]
+            idf = math.log((n - len(ids) + 0.5) / (len(ids) + 0.5) + 1.0)
+            
+            for chunk_id, tf in zip(ids, tfs):
+                norm = k1 * (1 - b + b * self.lengths[chunk_id] / avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
@@ -1,8 +1,15 @@
 """Document processing for various file types."""
 
-from typing import BinaryIO
+import io
+from typing import Any, BinaryIO, Callable, Dict, Optional
 import pandas as pd
 from config.settings import Config
+from processors.pdf_extractor import PdfExtractor
+from processors.tabular_stats import TableSummarizer
+from processors.excel_reader import iter_workbook_sheets, make_header
+from processors.docx_extractor import extract_docx_text
+from processors.document_cache import content_hash, get_document_cache
+from processors.document_index import DocumentIndex
 
 # Document processing imports
 try:
@@ -13,6 +20,15 @@ try:
 except ImportError:
     PDF_SUPPORT = False
 
+# Bump whenever extraction output changes so cached results are not reused
+PROCESSOR_VERSION = "2"
+
+# Called with the completed fraction (0-1) and a short stage description
+ProgressCallback = Callable[[float, str], None]
+
+class ProcessingCancelled(Exception):
+    """Raised from a progress callback to abandon processing a file."""
+
 class DocumentProcessor:
     """Handle document processing for various file types."""
     
@@ -22,57 +38,79 @@ class DocumentProcessor:
         return PDF_SUPPORT
     
     @staticmethod
-    def process_pdf(file: BinaryIO) -> str:
+    def process_pdf(file: BinaryIO,
+                    on_page: Optional[Callable[[int, int], None]] = None) -> str:
         """Extract text from PDF file."""
         try:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            return PdfExtractor(on_page=on_page).extract_text(file)
+        except ProcessingCancelled:
+            raise
         except Exception as e:
             return f"Error processing PDF: {str(e)}"
     
     @staticmethod
     def process_docx(file: BinaryIO) -> str:
-        """Extract text from DOCX file."""
+        """Extract text from DOCX file, including tables."""
         try:
-            doc = Document(file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return extract_docx_text(file)
         except Exception as e:
             return f"Error processing DOCX: {str(e)}"
     
     @staticmethod
     def process_excel(file: BinaryIO) -> str:
-        """Extract data from Excel file."""
+        """Extract data from every sheet of an Excel file by streaming its rows."""
         try:
-            try:
-                df = pd.read_excel(file, engine='openpyxl')
-            except Exception:
-                df = pd.read_excel(file, engine='xlrd')
+            data = file.getvalue() if hasattr(file, 'getvalue') else file.read()
             
-            text = f"Excel Data Summary:\n"
-            text += f"Shape: {df.shape[0]} rows, {df.shape[1]} columns\n\n"
-            text += f"Columns: {', '.join(df.columns)}\n\n"
-            text += "Data Preview:\n"
-            text += df.head(10).to_string()
-            
-            numeric_cols = df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) > 0:
-                text += "\n\nNumeric Summary:\n"
-                text += df[numeric_cols].describe().to_string()
+            sections = []
+            for sheet_name, rows in iter_workbook_sheets(data):
+                summarizer = DocumentProcessor._summarize_sheet(rows)
+                if summarizer is None:
+                    continue
+                sections.append(f"--- Sheet: {sheet_name} ---\n" +
+                                summarizer.summary_text("Excel"))
             
-            return text
+            if not sections:
+                return "Excel Data Summary:\nShape: 0 rows, 0 columns\n"
+            return "\n\n".join(sections)
         except Exception as e:
             return f"Error processing Excel: {str(e)}"
     
+    @staticmethod
+    def _summarize_sheet(rows) -> Optional[TableSummarizer]:
+        """Feed sheet rows into a summarizer in fixed-size batches."""
+        header = None
+        batch = []
+        summarizer = TableSummarizer()
+        
+        for row in rows:
+            if all(value is None or value == "" for value in row):
+                continue
+            
+            if header is None:
+                header = make_header(row)
+                continue
+            
+            row = list(row[:len(header)]) + [None] * (len(header) - len(row))
+            batch.append(row)
+            if len(batch) >= Config.EXCEL_CHUNK_ROWS:
+                summarizer.update(pd.DataFrame(batch, columns=header))
+                batch = []
+        
+        if header is None:
+            return None
+        
+        if batch or summarizer.rows == 0:
+            summarizer.update(pd.DataFrame(batch, columns=header))
+        return summarizer
+    
     @staticmethod
     def process_csv(file: BinaryIO) -> str:
         """Extract data from CSV file."""
         try:
+            if DocumentProcessor._file_size(file) > Config.CSV_STREAMING_THRESHOLD:
+                return DocumentProcessor.process_csv_streaming(file)
+            
             df = pd.read_csv(file)
             
             text = f"CSV Data Summary:\n"
@@ -90,18 +128,88 @@ class DocumentProcessor:
         except Exception as e:
             return f"Error processing CSV: {str(e)}"
     
+    @staticmethod
+    def process_csv_streaming(file: BinaryIO) -> str:
+        """Summarize a CSV file chunk by chunk with bounded memory."""
+        try:
+            summarizer = TableSummarizer()
+            for chunk in pd.read_csv(file, chunksize=Config.CSV_CHUNK_ROWS):
+                summarizer.update(chunk)
+            return summarizer.summary_text("CSV")
+        except Exception as e:
+            return f"Error processing CSV: {str(e)}"
+    
+    @staticmethod
+    def _file_size(file: BinaryIO) -> int:
+        """Return the size of an uploaded file without reading it."""
+        size = getattr(file, 'size', None)
+        if size is None:
+            position = file.tell()
+            size = file.seek(0, 2)
+            file.seek(position)
+        return size
+    
     def process_file(self, uploaded_file, file_type: str) -> str:
         """Process file based on its type."""
+        return self.process_document(uploaded_file, file_type)['content']
+    
+    def process_document(self, uploaded_file, file_type: str,
+                         progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Process a file, reusing cached text and index for identical content.
+        
+        Returns a dict with ``content``, ``index`` and the content ``hash``.
+        ``progress`` is told about each stage (and each PDF page); raising
+        ``ProcessingCancelled`` from it stops processing.
+        """
         if not self.is_supported():
-            return "Document processing not available. Please install required packages."
+            content = "Document processing not available. Please install required packages."
+            return {'content': content, 'index': None, 'hash': None}
+        
+        report = progress or (lambda fraction, stage: None)
+        report(0.0, "Reading file")
+        data = uploaded_file.getvalue() if hasattr(uploaded_file, 'getvalue') else uploaded_file.read()
+        digest = content_hash(data)
+        cache = get_document_cache()
+        text_key = cache.make_key(digest, file_type, PROCESSOR_VERSION, "text")
+        index_key = cache.make_key(digest, file_type, PROCESSOR_VERSION, "index")
+        
+        content = cache.get(text_key)
+        if content is None:
+            report(0.05, "Extracting text")
+            content = self._extract(io.BytesIO(data), file_type, report)
+            if self._is_error(content):
+                return {'content': content, 'index': None, 'hash': digest}
+            cache.set(text_key, content)
         
+        index = cache.get(index_key)
+        if index is None:
+            report(0.9, "Indexing")
+            index = DocumentIndex(content)
+            cache.set(index_key, index)
+        
+        report(1.0, "Done")
+        return {'content': content, 'index': index, 'hash': digest}
+    
+    def _extract(self, file: BinaryIO, file_type: str,
+                 progress: Optional[ProgressCallback] = None) -> str:
+        """Dispatch to the extractor for ``file_type``."""
         if file_type == 'pdf':
-            return self.process_pdf(uploaded_file)
+            on_page = None
+            if progress is not None:
+                # Pages cover the span between "Extracting text" and "Indexing"
+                on_page = lambda done, total: progress(0.05 + 0.85 * done / total,
+                                                       f"Page {done} of {total}")
+            return self.process_pdf(file, on_page)
         elif file_type == 'docx':
-            return self.process_docx(uploaded_file)
+            return self.process_docx(file)
         elif file_type in ['xlsx', 'xls']:
-            return self.process_excel(uploaded_file)
+            return self.process_excel(file)
         elif file_type == 'csv':
-            return self.process_csv(uploaded_file)
+            return self.process_csv(file)
         else:
-            return f"Unsupported file type: {file_type}"
\ No newline at end of file
+            return f"Unsupported file type: {file_type}"
+    
+    @staticmethod
+    def _is_error(content: str) -> bool:
+        """Check whether extraction returned an error message instead of text."""
+        return content.startswith(("Error processing", "Unsupported file type"))
@@ -0,0 +1,87 @@
+"""Split long extracted documents into sections for map-reduce summarization."""
+
+import re
+from typing import List, NamedTuple
+from config.settings import Config
+
+# Lines such as "Chapter 3", "CHAPTER IV: Markets", "Part Two", "# Heading"
+HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:(?:chapter|part|book|unit|section|lecture)[ \t]+'
+    r'(?:\d+|[ivxlc]+|one|two|three|four|five|six|seven|eight|nine|ten)\b[^\n]{0,80}'
+    r'|#{1,3}[ \t]+[^\n]{1,80})[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+class Section(NamedTuple):
+    """A titled slice of a document."""
+    title: str
+    text: str
+
+def split_sections(text: str, max_chars: int = None,
+                   max_sections: int = None) -> List[Section]:
+    """Split ``text`` at chapter-style headings, falling back to fixed-size parts.
+    
+    Sections longer than ``max_chars`` are cut further at paragraph breaks.
+    At most ``max_sections`` are returned, which bounds the number of model
+    calls: the size limit is raised first, and if the headings alone are
+    too many, the shortest neighbouring sections are merged.
+    """
+    max_chars = max_chars or Config.SUMMARY_SECTION_CHARS
+    max_sections = max_sections or Config.SUMMARY_MAX_SECTIONS
+    
+    headings = list(HEADING_PATTERN.finditer(text))
+    if len(headings) >= 2:
+        bounds = [(m.group().strip(' \t#'), m.start()) for m in headings]
+        if bounds[0][1] > 0 and text[:bounds[0][1]].strip():
+            bounds.insert(0, ("Front matter", 0))
+    else:
+        bounds = [("", 0)]
+    
+    bodies = []
+    for i, (title, start) in enumerate(bounds):
+        end = bounds[i + 1][1] if i + 1 < len(bounds) else len(text)
+        body = text[start:end].strip()
+        if body:
+            bodies.append((title, body))
+    
+    while True:
+        sections = []
+        for title, body in bodies:
+            parts = _split_by_size(body, max_chars)
+            for number, part in enumerate(parts, 1):
+                if not title:
+                    label = f"Part {number}"
+                elif len(parts) > 1:
+                    label = f"{title} ({number}/{len(parts)})"
+                else:
+                    label = title
+                sections.append(Section(label, part))
+        if len(sections) <= max_sections or len(bodies) >= max_sections:
+            break
+        max_chars = int(max_chars * 1.25)
+    
+    # Too many headings: merge the shortest neighbouring pair until it fits
+    while len(sections) > max_sections:
+        i = min(range(len(sections) - 1),
+                key=lambda j: len(sections[j].text) + len(sections[j + 1].text))
+        first, second = sections[i], sections[i + 1]
+        sections[i:i + 2] = [Section(f"{first.title} - {second.title}",
+                                     first.text + "\n\n" + second.text)]
+    
+    return sections
+
+def _split_by_size(text: str, max_chars: int) -> List[str]:
+    """Cut ``text`` into pieces of at most ``max_chars``, preferring paragraph breaks."""
+    parts = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = text.rfind("\n\n", start + max_chars // 2, end)
+        if cut == -1:
+            cut = text.rfind("\n", start + max_chars // 2, end)
+        if cut == -1:
+            cut = end
+        parts.append(text[start:cut].strip())
+        start = cut
+    parts.append(text[start:].strip())
+    return [part for part in parts if part]
@@ -0,0 +1,87 @@
+"""Streaming DOCX text extraction straight from ``word/document.xml``."""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterator, List
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PARAGRAPH = W + 'p'
+TEXT = W + 't'
+TAB = W + 'tab'
+# Paragraph properties hold tab-stop definitions (<w:tabs><w:tab/>), not tabs
+PARAGRAPH_PROPERTIES = W + 'pPr'
+BREAKS = (W + 'br', W + 'cr')
+BODY = W + 'body'
+TABLE = W + 'tbl'
+ROW = W + 'tr'
+CELL = W + 'tc'
+
+def iter_docx_blocks(file: BinaryIO) -> Iterator[str]:
+    """Yield paragraphs and table rows in document order.
+    
+    The XML is parsed incrementally and each top-level block is dropped from
+    ``<w:body>`` once its text has been collected, so no document tree is
+    built. Table rows are
+    emitted as ``cell | cell | cell``; nested tables are flattened into the
+    enclosing cell.
+    """
+    with zipfile.ZipFile(file) as archive, archive.open('word/document.xml') as xml:
+        runs: List[str] = []
+        # One entry per open table: [current_row_cells, current_cell_lines]
+        tables: List[List[List[str]]] = []
+        in_properties = 0
+        body = None
+        
+        for event, elem in ET.iterparse(xml, events=('start', 'end')):
+            tag = elem.tag
+            
+            if event == 'start':
+                if tag == TABLE:
+                    tables.append([[], []])
+                elif tag == ROW and tables:
+                    tables[-1][0] = []
+                elif tag == CELL and tables:
+                    tables[-1][1] = []
+                elif tag == PARAGRAPH_PROPERTIES:
+                    in_properties += 1
+                elif tag == BODY:
+                    body = elem
+                continue
+            
+            if tag == TEXT:
+                runs.append(elem.text or '')
+            elif tag == PARAGRAPH_PROPERTIES:
+                in_properties -= 1
+            elif tag == TAB and not in_properties:
+                runs.append('\t')
+            elif tag in BREAKS:
+                runs.append('\n')
+            elif tag == PARAGRAPH:
+                text = ''.join(runs)
+                runs = []
+                if tables:
+                    tables[-1][1].append(text)
+                    elem.clear()
+                else:
+                    yield text
+                    body.clear()
+            elif tag == CELL and tables:
+                cell_text = ' '.join(line.strip() for line in tables[-1][1] if line.strip())
+                tables[-1][0].append(cell_text)
+            elif tag == ROW and tables:
+                row_text = ' | '.join(tables[-1][0])
+                if len(tables) > 1:
+                    tables[-2][1].append(row_text)
+                elif row_text.strip(' |'):
+                    yield row_text
+                elem.clear()
+            elif tag == TABLE:
+                tables.pop()
+                if tables:
+                    elem.clear()
+                else:
+                    body.clear()
+
+def extract_docx_text(file: BinaryIO) -> str:
+    """Return the text of a DOCX file, including tables."""
+    return "\n".join(iter_docx_blocks(file)).strip()
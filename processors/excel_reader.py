@@ -0,0 +1,74 @@
+"""Row-streaming readers for Excel workbooks (.xlsx and legacy .xls)."""
+
+import io
+from typing import Any, Iterator, List, Sequence, Tuple
+
+try:
+    import openpyxl
+    XLSX_SUPPORT = True
+except ImportError:
+    XLSX_SUPPORT = False
+
+try:
+    import xlrd
+    XLS_SUPPORT = True
+except ImportError:
+    XLS_SUPPORT = False
+
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0"
+
+Row = Sequence[Any]
+
+def iter_workbook_sheets(data: bytes) -> Iterator[Tuple[str, Iterator[Row]]]:
+    """Yield ``(sheet_name, rows)`` for every sheet, without loading whole sheets.
+    
+    The format is detected from the file signature rather than the extension,
+    so mislabelled uploads still go to the right reader.
+    """
+    if data[:4] == OLE_MAGIC:
+        yield from _iter_xls_sheets(data)
+    elif data[:4] == ZIP_MAGIC:
+        yield from _iter_xlsx_sheets(data)
+    else:
+        raise ValueError("Unrecognized Excel file format")
+
+def _iter_xlsx_sheets(data: bytes) -> Iterator[Tuple[str, Iterator[Row]]]:
+    """Iterate .xlsx sheets in openpyxl read-only mode."""
+    if not XLSX_SUPPORT:
+        raise ImportError("Please install openpyxl to read .xlsx files")
+    
+    workbook = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            yield worksheet.title, worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def _iter_xls_sheets(data: bytes) -> Iterator[Tuple[str, Iterator[Row]]]:
+    """Iterate legacy .xls sheets with xlrd, loading one sheet at a time."""
+    if not XLS_SUPPORT:
+        raise ImportError("Please install xlrd to read .xls files")
+    
+    workbook = xlrd.open_workbook(file_contents=data, on_demand=True)
+    try:
+        for index in range(workbook.nsheets):
+            sheet = workbook.sheet_by_index(index)
+            yield sheet.name, (sheet.row_values(row) for row in range(sheet.nrows))
+            workbook.unload_sheet(index)
+    finally:
+        workbook.release_resources()
+
+def make_header(row: Row) -> List[str]:
+    """Build unique column names from a header row, pandas-style."""
+    names: List[str] = []
+    seen = {}
+    for position, value in enumerate(row):
+        name = str(value) if value not in (None, "") else f"Unnamed: {position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
@@ -0,0 +1,99 @@
+"""Content-aware image encoding for model uploads."""
+
+import io
+from typing import Any, Dict, Optional, Tuple
+from config.settings import Config
+
+try:
+    from PIL import Image, ImageChops, features
+    WEBP_SUPPORT = features.check('webp')
+except ImportError:
+    WEBP_SUPPORT = False
+
+CLASSIFY_SIZE = 256
+PALETTE_COLORS = 256
+FLAT_RATIO_THRESHOLD = 0.5
+
+def classify_image(image: "Image.Image") -> Tuple[str, Optional[int]]:
+    """Classify an RGB image as ``"diagram"`` or ``"photo"``.
+    
+    Works on a nearest-neighbour thumbnail so no new colours are invented.
+    Images with a small palette, or where most neighbouring pixels are
+    identical (flat fills, screenshots), are diagrams. Returns the kind and
+    the palette size when it is small enough to encode as a palette PNG.
+    """
+    sample = image.copy()
+    sample.thumbnail((CLASSIFY_SIZE, CLASSIFY_SIZE), Image.Resampling.NEAREST)
+    
+    colors = sample.getcolors(maxcolors=PALETTE_COLORS)
+    if colors is not None:
+        return "diagram", len(colors)
+    
+    gray = sample.convert('L')
+    shifted = ImageChops.offset(gray, 1, 0)
+    histogram = ImageChops.difference(gray, shifted).histogram()
+    flat_ratio = histogram[0] / max(1, sum(histogram))
+    return ("diagram" if flat_ratio > FLAT_RATIO_THRESHOLD else "photo"), None
+
+def _save(image: "Image.Image", fmt: str, **options: Any) -> bytes:
+    buffered = io.BytesIO()
+    image.save(buffered, format=fmt, **options)
+    return buffered.getvalue()
+
+def _encode_jpeg_to_budget(image: "Image.Image", target_bytes: int) -> Tuple[bytes, int]:
+    """Return the highest-quality JPEG (up to q85) that fits ``target_bytes``."""
+    best = _save(image, "JPEG", quality=Config.IMAGE_MAX_QUALITY)
+    if len(best) <= target_bytes:
+        return best, Config.IMAGE_MAX_QUALITY
+    
+    low, high = Config.IMAGE_MIN_QUALITY, Config.IMAGE_MAX_QUALITY - 1
+    best_quality = low
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        data = _save(image, "JPEG", quality=quality)
+        if len(data) <= target_bytes:
+            best, best_quality = data, quality
+            low = quality + 1
+        else:
+            high = quality - 1
+    
+    if best is None:
+        best = _save(image, "JPEG", quality=Config.IMAGE_MIN_QUALITY)
+    return best, best_quality
+
+def encode_image(image: "Image.Image", target_bytes: int = None) -> Dict[str, Any]:
+    """Pick a format and quality for ``image`` and encode it.
+    
+    Diagrams and screenshots are encoded losslessly (palette PNG when they
+    have few colours, otherwise WebP lossless if available, else PNG) so
+    lines and text stay sharp; photos use the best JPEG quality that fits
+    the byte budget. Returns ``data``, ``mime_type``, ``format`` and ``kind``.
+    """
+    target_bytes = target_bytes or Config.IMAGE_TARGET_BYTES
+    kind, palette_size = classify_image(image)
+    
+    if kind == "diagram":
+        if palette_size is not None:
+            palette = image.quantize(PALETTE_COLORS, method=Image.Quantize.FASTOCTREE)
+            data, fmt = _save(palette, "PNG"), "PNG"
+        elif WEBP_SUPPORT:
+            data, fmt = _save(image, "WEBP", lossless=True, method=Config.IMAGE_WEBP_METHOD), "WEBP"
+        else:
+            data, fmt = _save(image, "PNG"), "PNG"
+        
+        # Very detailed "diagrams" can still be smaller as a high-quality JPEG
+        if len(data) > target_bytes:
+            jpeg = _save(image, "JPEG", quality=90)
+            if len(jpeg) < len(data):
+                data, fmt = jpeg, "JPEG"
+    else:
+        data, _ = _encode_jpeg_to_budget(image, target_bytes)
+        fmt = "JPEG"
+    
+    return {
+        "data": data,
+        "mime_type": f"image/{fmt.lower()}",
+        "format": fmt,
+        "kind": kind
+    }
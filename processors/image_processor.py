@@ -1,16 +1,36 @@
 """Image processing and analysis."""
 
-import base64
 import io
-from typing import Dict, Any, BinaryIO
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, BinaryIO, Optional
 from config.settings import Config
+from processors.image_encoder import encode_image
 
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps
     IMAGE_SUPPORT = True
 except ImportError:
     IMAGE_SUPPORT = False
 
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_image_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for image preprocessing.
+    
+    Pillow releases the GIL while decoding, resizing and encoding, so
+    threads give real parallelism here without pickling image data.
+    """
+    global _executor
+    
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.IMAGE_WORKERS,
+                                               thread_name_prefix="edubot-image")
+    return _executor
+
 class ImageProcessor:
     """Handle image processing and analysis."""
     
@@ -30,38 +50,56 @@ class ImageProcessor:
         
         try:
             image = Image.open(uploaded_file)
-            
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
             width, height = image.size
             file_size = getattr(uploaded_file, 'size', 0)
             
-            # Resize if too large (Gemini has size limits)
+            # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while decoding
             max_size = Config.MAX_IMAGE_SIZE
             if width > max_size or height > max_size:
                 ratio = min(max_size/width, max_size/height)
-                new_width = int(width * ratio)
-                new_height = int(height * ratio)
-                image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+                target = (int(width * ratio), int(height * ratio))
+                if image.format == 'JPEG':
+                    image.draft('RGB', target)
+            else:
+                target = None
             
-            # Convert to base64
-            buffered = io.BytesIO()
-            image.save(buffered, format="JPEG", quality=85)
-            img_bytes = buffered.getvalue()
-            img_base64 = base64.b64encode(img_bytes).decode()
+            # Decode exactly once; everything below works on this frame
+            image = ImageOps.exif_transpose(image)
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            
+            # Resize if too large (Gemini has size limits)
+            if target is not None:
+                image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS, reducing_gap=3.0)
+            
+            # Keep the encoded bytes; base64 is applied only when sending
+            encoded = encode_image(image)
             
             return {
                 "success": True,
-                "base64_data": img_base64,
+                "image_bytes": encoded["data"],
+                "mime_type": encoded["mime_type"],
+                "content_kind": encoded["kind"],
+                "preview": ImageProcessor._make_preview(image),
                 "original_size": (width, height),
                 "processed_size": image.size,
                 "file_size": file_size,
-                "format": image.format or "JPEG"
+                "format": encoded["format"]
             }
             
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+    
+    @staticmethod
+    def _make_preview(image: "Image.Image") -> bytes:
+        """Encode a small JPEG thumbnail from an already decoded image."""
+        preview = image.copy()
+        size = Config.IMAGE_PREVIEW_SIZE
+        preview.thumbnail((size, size), Image.Resampling.BILINEAR)
+        
+        buffered = io.BytesIO()
+        preview.save(buffered, format="JPEG", quality=80)
+        return buffered.getvalue()
@@ -0,0 +1,230 @@
+"""Concurrent fetching and passage extraction for search-result pages."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from config.settings import Config
+from utils.cache import LRUCache
+from utils.http import get_http_session
+from processors.document_index import DocumentIndex
+
+SKIP_TAGS = frozenset([
+    'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe',
+    'nav', 'header', 'footer', 'aside', 'form', 'button', 'select'
+])
+
+BLOCK_TAGS = frozenset([
+    'p', 'div', 'section', 'article', 'main', 'br', 'li', 'ul', 'ol', 'tr',
+    'table', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'pre'
+])
+
+VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+])
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+class MainTextExtractor(HTMLParser):
+    """Collect readable text from HTML, skipping scripts and page chrome.
+    
+    Text inside ``<article>`` or ``<main>`` is collected separately so the
+    page body can be preferred over sidebars and link lists.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.main_parts: List[str] = []
+        self._skip_depth = 0
+        self._main_depth = 0
+    
+    def handle_starttag(self, tag, attrs) -> None:
+        """Track skipped/main regions and break lines at block tags."""
+        if tag in VOID_TAGS:
+            if tag == 'br':
+                self._newline()
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in ('article', 'main'):
+            self._main_depth += 1
+        if tag in BLOCK_TAGS:
+            self._newline()
+    
+    def handle_endtag(self, tag) -> None:
+        """Close skipped/main regions."""
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in ('article', 'main'):
+            self._main_depth = max(0, self._main_depth - 1)
+        if tag in BLOCK_TAGS:
+            self._newline()
+    
+    def handle_data(self, data) -> None:
+        """Collect visible text with whitespace collapsed."""
+        if self._skip_depth:
+            return
+        text = " ".join(data.split())
+        if not text:
+            return
+        self.parts.append(text)
+        if self._main_depth:
+            self.main_parts.append(text)
+    
+    def _newline(self) -> None:
+        """Record a line break outside skipped regions."""
+        if not self._skip_depth:
+            self.parts.append("\n")
+            if self._main_depth:
+                self.main_parts.append("\n")
+    
+    def text(self, min_main_chars: int = 500) -> str:
+        """Return the main content if substantial, otherwise all visible text."""
+        main = self._join(self.main_parts)
+        return main if len(main) >= min_main_chars else self._join(self.parts)
+    
+    @staticmethod
+    def _join(parts: List[str]) -> str:
+        """Join collected parts into non-empty, stripped lines."""
+        lines = " ".join(parts).split("\n")
+        return "\n".join(line.strip() for line in lines if line.strip())
+
+def extract_main_text(html: str) -> str:
+    """Extract readable text from an HTML document."""
+    parser = MainTextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # Malformed markup: keep whatever was collected before the error
+        pass
+    return parser.text()
+
+class PageFetcher:
+    """Fetch several pages concurrently under a shared deadline.
+    
+    Bodies are streamed and truncated at ``max_bytes``; extracted text is
+    cached per URL so popular results are only downloaded once per TTL.
+    Pages still downloading when the deadline passes are dropped.
+    """
+    
+    def __init__(self, max_bytes: int = None, max_workers: int = None,
+                 cache_ttl: float = None) -> None:
+        """Initialize the fetcher."""
+        self.max_bytes = max_bytes or Config.WEB_FETCH_MAX_BYTES
+        self.session = get_http_session("web")
+        self.headers = {"User-Agent": Config.WEB_FETCH_USER_AGENT}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or Config.WEB_FETCH_WORKERS,
+                                            thread_name_prefix="edubot-fetch")
+        self.cache = LRUCache(
+            max_entries=Config.WEB_SEARCH_CACHE_MAX_ENTRIES,
+            ttl=Config.WEB_SEARCH_CACHE_TTL if cache_ttl is None else cache_ttl,
+            max_bytes=Config.WEB_PAGE_CACHE_MAX_BYTES,
+            sizeof=len
+        )
+        self.fetched = 0
+        self.dropped = 0
+        self.failed = 0
+    
+    def fetch_text(self, url: str, deadline: float) -> Optional[str]:
+        """Download ``url`` and return its main text, or None on failure."""
+        cached = self.cache.get(url)
+        if cached is not None:
+            return cached or None
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        
+        try:
+            with self.session.get(url, headers=self.headers, stream=True,
+                                  timeout=(min(Config.GEMINI_CONNECT_TIMEOUT, remaining), remaining),
+                                  allow_redirects=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', 'text/html').lower()
+                if not content_type.startswith(HTML_CONTENT_TYPES):
+                    self.cache.set(url, "", ttl=Config.WEB_FETCH_FAILURE_TTL)
+                    return None
+                
+                body = bytearray()
+                for block in response.iter_content(chunk_size=16 * 1024):
+                    body.extend(block)
+                    if len(body) >= self.max_bytes or time.monotonic() >= deadline:
+                        break
+                
+                encoding = response.encoding or 'utf-8'
+                html = bytes(body[:self.max_bytes]).decode(encoding, errors='replace')
+        except Exception:
+            # Remember failures briefly so repeated queries skip dead links
+            self.failed += 1
+            self.cache.set(url, "", ttl=Config.WEB_FETCH_FAILURE_TTL)
+            return None
+        
+        text = html if content_type.startswith('text/plain') else extract_main_text(html)
+        self.cache.set(url, text)
+        self.fetched += 1
+        return text
+    
+    def fetch_many(self, urls: List[str], deadline: float) -> Dict[str, str]:
+        """Fetch ``urls`` concurrently, returning the texts finished by ``deadline``."""
+        futures = {self._executor.submit(self.fetch_text, url, deadline): url for url in urls}
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+        
+        for future in not_done:
+            future.cancel()
+        self.dropped += len(not_done)
+        
+        texts = {}
+        for future in done:
+            text = future.result()
+            if text:
+                texts[futures[future]] = text
+        return texts
+    
+    def add_passages(self, query: str, results: List[Dict[str, str]],
+                     deadline: float, top_k: int = None) -> List[Dict[str, str]]:
+        """Attach the most query-relevant passages of each result page.
+        
+        Results are returned in their original order; those whose page could
+        not be fetched in time keep only the search snippet.
+        """
+        top_k = top_k or Config.WEB_FETCH_TOP_K
+        urls = [r['href'] for r in results[:top_k]
+                if r.get('href', '').startswith(('http://', 'https://'))]
+        if not urls:
+            return results
+        
+        texts = self.fetch_many(urls, deadline)
+        
+        enriched = []
+        for result in results:
+            text = texts.get(result.get('href'))
+            if text:
+                index = DocumentIndex(text, chunk_size=Config.WEB_PASSAGE_CHARS, overlap=0)
+                hits = index.search(query, top_k=Config.WEB_PASSAGES_PER_PAGE)
+                passages = [" ".join(index.chunk(chunk_id).split()) for chunk_id, _ in sorted(hits)]
+                if passages:
+                    result = dict(result, passages=passages)
+            enriched.append(result)
+        return enriched
+    
+    def stats(self) -> Dict[str, int]:
+        """Return fetch counters."""
+        return {"fetched": self.fetched, "dropped": self.dropped, "failed": self.failed}
+
+_fetcher: Optional[PageFetcher] = None
+_fetcher_lock = threading.Lock()
+
+def get_page_fetcher() -> PageFetcher:
+    """Return the process-wide page fetcher."""
+    global _fetcher
+    
+    if _fetcher is None:
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = PageFetcher()
+    return _fetcher
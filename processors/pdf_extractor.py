@@ -0,0 +1,159 @@
+"""Page-parallel PDF text extraction."""
+
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+from config.settings import Config
+
+try:
+    import PyPDF2
+    PDF_SUPPORT = True
+except ImportError:
+    PDF_SUPPORT = False
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Return the process-wide, bounded pool used for page extraction."""
+    global _executor
+    
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Forking the threaded server could copy locks held by other threads
+                _executor = ProcessPoolExecutor(max_workers=Config.PDF_MAX_WORKERS,
+                                                mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+def _extract_page_range(path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """Extract pages ``start`` to ``end`` (0-based, exclusive) in a worker process."""
+    reader = PyPDF2.PdfReader(path)
+    return [(number + 1, _extract_page(reader, number)) for number in range(start, end)]
+
+def _extract_page(reader, number: int) -> str:
+    """Extract one page, treating unreadable pages as empty."""
+    try:
+        return reader.pages[number].extract_text() or ""
+    except Exception:
+        return ""
+
+class PdfExtractor:
+    """Extract PDF text page by page, fanning large files out to a process pool.
+    
+    Pages are yielded lazily in order with their 1-based page numbers. After
+    iteration ``total_pages``, ``pages_extracted`` and ``truncated`` describe
+    how much of the document was read within the page and time limits.
+    
+    ``on_page(pages_extracted, pages_to_extract)`` is called as pages arrive;
+    an exception raised from it stops extraction.
+    """
+    
+    def __init__(self, max_pages: int = None, time_budget: float = None,
+                 on_page: Optional[Callable[[int, int], None]] = None) -> None:
+        """Initialize the extractor limits."""
+        # 0 disables a limit; None uses the configured one
+        self.max_pages = Config.PDF_MAX_PAGES if max_pages is None else max_pages
+        self.time_budget = Config.PDF_TIME_BUDGET if time_budget is None else time_budget
+        self.on_page = on_page
+        self.total_pages = 0
+        self.pages_extracted = 0
+        self.truncated = False
+        self._timed_out = False
+    
+    def iter_pages(self, file: BinaryIO) -> Iterator[Tuple[int, str]]:
+        """Yield ``(page_number, text)`` pairs in page order."""
+        data = file.getvalue() if hasattr(file, 'getvalue') else file.read()
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        
+        self.total_pages = len(reader.pages)
+        self.pages_extracted = 0
+        limit = min(self.total_pages, self.max_pages) if self.max_pages else self.total_pages
+        self.truncated = limit < self.total_pages
+        self._timed_out = False
+        deadline = time.monotonic() + self.time_budget if self.time_budget else None
+        
+        next_page = 0
+        if limit > Config.PDF_PARALLEL_MIN_PAGES and Config.PDF_MAX_WORKERS > 1:
+            for page in self._iter_parallel(data, limit, deadline):
+                next_page = page[0]
+                self.pages_extracted += 1
+                if self.on_page is not None:
+                    self.on_page(self.pages_extracted, limit)
+                yield page
+            # A broken pool falls through to in-process extraction below
+            if self._timed_out:
+                return
+        
+        # Small documents, or whatever the pool could not handle, run in-process
+        for number in range(next_page, limit):
+            if deadline is not None and time.monotonic() > deadline:
+                self.truncated = True
+                return
+            self.pages_extracted += 1
+            page_text = _extract_page(reader, number)
+            if self.on_page is not None:
+                self.on_page(self.pages_extracted, limit)
+            yield number + 1, page_text
+    
+    def _iter_parallel(self, data: bytes, limit: int,
+                       deadline: Optional[float]) -> Iterator[Tuple[int, str]]:
+        """Extract page ranges in worker processes, yielding them in order."""
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        futures = []
+        
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            
+            executor = get_pdf_executor()
+            step = Config.PDF_PAGES_PER_TASK
+            futures = [executor.submit(_extract_page_range, path, start, min(start + step, limit))
+                       for start in range(0, limit, step)]
+            
+            for future in futures:
+                timeout = None
+                if deadline is not None:
+                    timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    pages = future.result(timeout=timeout)
+                except FutureTimeoutError:
+                    self._timed_out = True
+                    self.truncated = True
+                    return
+                yield from pages
+        
+        except (BrokenProcessPool, OSError):
+            # Fall back to in-process extraction from the first missing page
+            _reset_pdf_executor()
+        
+        finally:
+            for future in futures:
+                future.cancel()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def extract_text(self, file: BinaryIO) -> str:
+        """Return the text of all extracted pages joined once at the end."""
+        text = "\n".join(page_text for _, page_text in self.iter_pages(file)).strip()
+        if self.truncated:
+            text += (f"\n\n[Extraction stopped after {self.pages_extracted} "
+                     f"of {self.total_pages} pages]")
+        return text
+
+def _reset_pdf_executor() -> None:
+    """Drop a broken pool so the next extraction starts a fresh one."""
+    global _executor
+    
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
@@ -0,0 +1,191 @@
+"""Bounded-memory running statistics for streaming tabular summaries."""
+
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from config.settings import Config
+
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+def _reservoir_slots(seen: int, n: int, size: int, rng: "np.random.Generator") -> "np.ndarray":
+    """Return the reservoir slot for each of ``n`` new items (-1 = not kept).
+    
+    Vectorized Algorithm R: item ``i`` (0-based overall) replaces a random
+    slot with probability ``size / (i + 1)``.
+    """
+    positions = np.arange(seen, seen + n)
+    slots = np.where(positions < size, positions, -1)
+    tail = positions >= size
+    if tail.any():
+        draws = (rng.random(int(tail.sum())) * (positions[tail] + 1)).astype(np.int64)
+        slots[tail] = np.where(draws < size, draws, -1)
+    return slots
+
+class ColumnStats:
+    """Running statistics for one column, updated chunk by chunk."""
+    
+    def __init__(self, name: str, sample_size: int, top_k: int,
+                 rng: "np.random.Generator") -> None:
+        """Initialize empty statistics."""
+        self.name = name
+        self.sample_size = sample_size
+        self.top_k = top_k
+        self.rng = rng
+        
+        self.count = 0
+        self.nulls = 0
+        self.non_numeric = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self._seen_numeric = 0
+        self._sample = np.empty(sample_size, dtype=np.float64)
+        self._top_values = pd.Series(dtype=np.int64)
+    
+    def update(self, series: pd.Series) -> None:
+        """Fold a chunk of values into the running statistics."""
+        null_mask = series.isna()
+        self.nulls += int(null_mask.sum())
+        present = series[~null_mask]
+        if present.empty:
+            return
+        
+        if (self.non_numeric or pd.api.types.is_bool_dtype(present) or
+                pd.api.types.is_datetime64_any_dtype(present)):
+            # Once a column is known to be categorical, skip numeric coercion
+            numeric = pd.Series(dtype=np.float64)
+        elif pd.api.types.is_numeric_dtype(present):
+            numeric = present.astype(np.float64)
+        else:
+            numeric = pd.to_numeric(present, errors='coerce').dropna()
+        
+        self.non_numeric += len(present) - len(numeric)
+        if len(numeric) < len(present):
+            self._update_top_values(present)
+        if not numeric.empty:
+            self._update_numeric(numeric.to_numpy())
+    
+    def _update_numeric(self, values: "np.ndarray") -> None:
+        """Merge chunk moments using Chan et al.'s parallel Welford update."""
+        n = len(values)
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+        
+        chunk_min, chunk_max = float(values.min()), float(values.max())
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        
+        slots = _reservoir_slots(self._seen_numeric, n, self.sample_size, self.rng)
+        kept = slots >= 0
+        self._sample[slots[kept]] = values[kept]
+        self._seen_numeric += n
+    
+    def _update_top_values(self, present: pd.Series) -> None:
+        """Merge chunk frequencies into a Misra-Gries sketch of ``top_k`` counters."""
+        counts = present.astype(str).value_counts()
+        merged = self._top_values.add(counts, fill_value=0)
+        if len(merged) > self.top_k:
+            cutoff = merged.nlargest(self.top_k + 1).iloc[-1]
+            merged = merged[merged > cutoff] - cutoff
+        self._top_values = merged.astype(np.int64)
+    
+    @property
+    def is_numeric(self) -> bool:
+        """Whether every non-null value seen was numeric."""
+        return self.count > 0 and self.non_numeric == 0
+    
+    def describe(self) -> List[float]:
+        """Return values matching ``DataFrame.describe()`` for numeric columns."""
+        sample = self._sample[:min(self._seen_numeric, self.sample_size)]
+        q25, q50, q75 = np.percentile(sample, [25, 50, 75])
+        std = (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else float('nan')
+        return [float(self.count), self.mean, std, self.min, q25, q50, q75, self.max]
+    
+    def top_values(self, limit: int = 5) -> pd.Series:
+        """Return the most frequent values (lower-bound counts)."""
+        return self._top_values.nlargest(limit)
+
+class TableSummarizer:
+    """Summarize a table streamed in chunks with memory independent of its size."""
+    
+    def __init__(self, preview_rows: int = 10, sample_rows: int = None,
+                 sample_size: int = None, top_k: int = None, seed: int = 0) -> None:
+        """Initialize an empty summary."""
+        self.preview_rows = preview_rows
+        self.sample_rows = sample_rows or Config.STREAMING_SAMPLE_ROWS
+        self.sample_size = sample_size or Config.STREAMING_QUANTILE_SAMPLE
+        self.top_k = top_k or Config.STREAMING_TOP_K
+        self.rng = np.random.default_rng(seed)
+        
+        self.rows = 0
+        self.column_names: List[str] = []
+        self.columns: Dict[str, ColumnStats] = {}
+        self.preview: Optional[pd.DataFrame] = None
+        self._sample: List[Any] = [None] * self.sample_rows
+    
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Fold a chunk of rows into the summary."""
+        if self.preview is None:
+            self.preview = chunk.head(self.preview_rows).copy()
+            self.column_names = [str(column) for column in chunk.columns]
+        
+        for column in chunk.columns:
+            key = str(column)
+            if key not in self.columns:
+                self.columns[key] = ColumnStats(key, self.sample_size, self.top_k, self.rng)
+            self.columns[key].update(chunk[column])
+        
+        slots = _reservoir_slots(self.rows, len(chunk), self.sample_rows, self.rng)
+        for position in np.flatnonzero(slots >= 0):
+            self._sample[slots[position]] = (self.rows + position, chunk.iloc[position])
+        
+        self.rows += len(chunk)
+    
+    def summary_text(self, title: str) -> str:
+        """Render the summary in the same layout as the in-memory summaries."""
+        if self.preview is None:
+            return f"{title} Data Summary:\nShape: 0 rows, 0 columns\n"
+        
+        text = f"{title} Data Summary:\n"
+        text += f"Shape: {self.rows} rows, {len(self.column_names)} columns\n\n"
+        text += f"Columns: {', '.join(self.column_names)}\n\n"
+        text += "Data Preview:\n"
+        text += self.preview.to_string()
+        
+        numeric = [stats for stats in self.columns.values() if stats.is_numeric]
+        if numeric:
+            text += "\n\nNumeric Summary:\n"
+            frame = pd.DataFrame({stats.name: stats.describe() for stats in numeric},
+                                 index=DESCRIBE_INDEX)
+            text += frame.to_string()
+        
+        nulls = {stats.name: stats.nulls for stats in self.columns.values() if stats.nulls}
+        if nulls:
+            text += "\n\nMissing Values:\n"
+            text += pd.Series(nulls).to_string()
+        
+        categorical = [stats for stats in self.columns.values()
+                       if not stats.is_numeric and len(stats.top_values())]
+        if categorical:
+            text += "\n\nMost Frequent Values (approximate):\n"
+            for stats in categorical:
+                values = ", ".join(f"{value} ({int(count)})"
+                                   for value, count in stats.top_values().items())
+                text += f"{stats.name}: {values}\n"
+            text = text.rstrip("\n")
+        
+        sampled = sorted(entry for entry in self._sample if entry is not None)
+        if self.rows > self.preview_rows and sampled:
+            text += f"\n\nRandom Sample ({len(sampled)} rows):\n"
+            frame = pd.DataFrame([row for _, row in sampled],
+                                 index=[index for index, _ in sampled])
+            text += frame.to_string()
+        
+        return text
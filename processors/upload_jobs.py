@@ -0,0 +1,184 @@
+"""Background processing of uploaded documents and images."""
+
+import io
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from config.settings import Config
+from processors.document_processor import DocumentProcessor, ProcessingCancelled
+from processors.image_processor import ImageProcessor, get_image_executor
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+class UploadJob:
+    """Handle to one uploaded file being processed in the background.
+    
+    Jobs are stored in session state, so a later rerun can show their
+    progress and pick up the result. Only the worker thread writes
+    ``progress``, ``stage`` and ``status``; the script thread reads them
+    and cancels through a flag. A job cancelled before it started never
+    reaches a worker, so only then does the pool's done callback set its
+    status.
+    """
+    
+    def __init__(self, kind: str, name: str, file_id: str, file_type: str, size: int) -> None:
+        """Initialize a queued job."""
+        self.kind = kind
+        self.name = name
+        self.file_id = file_id
+        self.file_type = file_type
+        self.size = size
+        
+        self.status = QUEUED
+        self.progress = 0.0
+        self.stage = "Waiting for a worker"
+        self.error: Optional[str] = None
+        self.collected = False
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+    
+    @property
+    def done(self) -> bool:
+        """Check whether the job has finished, failed or been cancelled."""
+        return self.status in (DONE, FAILED, CANCELLED)
+    
+    def report(self, fraction: float, stage: str) -> None:
+        """Record progress from the worker, stopping it if the job was cancelled."""
+        if self._cancel.is_set():
+            raise ProcessingCancelled(self.name)
+        self.progress = min(1.0, max(0.0, fraction))
+        self.stage = stage
+    
+    def cancel(self) -> None:
+        """Cancel the job; a running job stops at its next progress report."""
+        self._cancel.set()
+        if self.future is not None:
+            # Succeeds only for a queued job, whose status _finished then sets
+            self.future.cancel()
+    
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Return the processing result of a finished job."""
+        if self.status != DONE or self.future is None:
+            return None
+        return self.future.result()
+    
+    def release(self) -> None:
+        """Drop the result once it has been moved into session state."""
+        self.future = None
+
+class UploadManager:
+    """Process-wide, bounded worker pool for upload processing.
+    
+    The Streamlit script only submits jobs and returns immediately, so a
+    large upload no longer blocks the UI or the chat; at most ``max_workers``
+    documents are processed at a time across all sessions, the rest wait in
+    the pool's queue. Images run on the image preprocessing pool
+    (``Config.IMAGE_WORKERS``), so they never queue behind a large PDF.
+    """
+    
+    def __init__(self, max_workers: int = None) -> None:
+        """Initialize the pool."""
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or Config.UPLOAD_WORKERS,
+                                           thread_name_prefix="edubot-upload")
+        self._lock = threading.Lock()
+        
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.active = 0
+    
+    def submit_document(self, uploaded_file: Any, file_type: str, file_id: str) -> UploadJob:
+        """Queue text extraction and indexing of a document."""
+        data = uploaded_file.getvalue()
+        job = UploadJob("document", uploaded_file.name, file_id, file_type, len(data))
+        
+        def work() -> Dict[str, Any]:
+            return DocumentProcessor().process_document(io.BytesIO(data), file_type,
+                                                        progress=job.report)
+        return self._submit(job, work)
+    
+    def submit_image(self, uploaded_image: Any, file_id: str) -> UploadJob:
+        """Queue resizing and encoding of an image."""
+        data = uploaded_image.getvalue()
+        file_type = uploaded_image.name.split('.')[-1].lower()
+        job = UploadJob("image", uploaded_image.name, file_id, file_type, len(data))
+        
+        def work() -> Dict[str, Any]:
+            file = io.BytesIO(data)
+            file.size = len(data)
+            job.report(0.1, "Resizing")
+            result = ImageProcessor.process_image(file)
+            if not result['success']:
+                raise ValueError(result['error'])
+            job.report(1.0, "Done")
+            return result
+        return self._submit(job, work, get_image_executor())
+    
+    def _submit(self, job: UploadJob, work: Callable[[], Dict[str, Any]],
+                executor: Optional[ThreadPoolExecutor] = None) -> UploadJob:
+        """Schedule ``work`` for ``job`` on ``executor`` (the document pool by default)."""
+        with self._lock:
+            self.submitted += 1
+            self.active += 1
+        job.future = (executor or self.executor).submit(self._run, job, work)
+        job.future.add_done_callback(lambda future: self._finished(job, future))
+        return job
+    
+    @staticmethod
+    def _run(job: UploadJob, work: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run one job in a worker thread, recording its final status."""
+        job.status = RUNNING
+        try:
+            job.report(0.0, "Starting")
+            result = work()
+        except ProcessingCancelled:
+            job.status = CANCELLED
+            raise
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.status = FAILED
+            raise
+        job.status = DONE
+        return result
+    
+    def _finished(self, job: UploadJob, future: Future) -> None:
+        """Update the counters when a job leaves the pool."""
+        if future.cancelled():
+            job.status = CANCELLED
+        with self._lock:
+            self.active -= 1
+            if job.status == DONE:
+                self.completed += 1
+            elif job.status == FAILED:
+                self.failed += 1
+            else:
+                self.cancelled += 1
+    
+    def stats(self) -> Dict[str, int]:
+        """Return job counters across all sessions."""
+        with self._lock:
+            return {
+                "active": self.active,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled
+            }
+
+_manager: Optional[UploadManager] = None
+_manager_lock = threading.Lock()
+
+def get_upload_manager() -> UploadManager:
+    """Return the process-wide upload worker pool."""
+    global _manager
+    
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = UploadManager()
+    return _manager
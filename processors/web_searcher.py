@@ -1,7 +1,12 @@
 """Web search functionality."""
 
-from typing import List, Dict
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional
 from config.settings import Config
+from utils.cache import LRUCache
+from utils.ratelimit import TokenBucket
 
 try:
     from duckduckgo_search import DDGS
@@ -9,6 +14,175 @@ try:
 except ImportError:
     WEB_SEARCH_SUPPORT = False
 
+class SearchRateLimited(Exception):
+    """Raised when the search rate limit leaves no token within the budget."""
+
+class SearchBackend:
+    """Interface for search providers.
+    
+    ``search`` returns ``{"title", "body", "href"}`` dicts and raises on
+    failure; the service decides what to cache and what to surface.
+    """
+    
+    def search(self, query: str, max_results: int) -> List[Dict[str, str]]:
+        """Run ``query`` against the provider."""
+        raise NotImplementedError
+
+class DuckDuckGoBackend(SearchBackend):
+    """Search backend keeping one long-lived DuckDuckGo client per thread.
+    
+    Searches run on the service's worker pool; a client per worker lets them
+    run concurrently instead of queueing behind one shared client.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize the backend; clients are created on first use."""
+        self._local = threading.local()
+    
+    def search(self, query: str, max_results: int) -> List[Dict[str, str]]:
+        """Search DuckDuckGo for ``query``."""
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = DDGS()
+        
+        try:
+            return [{
+                "title": r.get("title", ""),
+                "body": r.get("body", ""),
+                "href": r.get("href", "")
+            } for r in client.text(query, max_results=max_results)]
+        except Exception:
+            # Start from a fresh client in case the session went bad
+            self._local.client = None
+            raise
+
+class SearchService:
+    """Cached, rate-limited and coalesced front end for a search backend.
+    
+    Identical queries (after normalization) share one cache entry for
+    ``cache_ttl`` seconds, and concurrent identical queries from different
+    sessions wait on a single backend call. Callers never wait longer than
+    ``latency_budget``; a search that overruns keeps going in the background
+    and fills the cache for the next caller.
+    """
+    
+    def __init__(self, backend: SearchBackend, cache_ttl: float = None,
+                 latency_budget: float = None, rate_limiter: Optional[TokenBucket] = None,
+                 max_entries: int = None, max_workers: int = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the service."""
+        self.backend = backend
+        self.latency_budget = (Config.WEB_SEARCH_LATENCY_BUDGET
+                               if latency_budget is None else latency_budget)
+        self.clock = clock
+        self.cache = LRUCache(
+            max_entries=max_entries or Config.WEB_SEARCH_CACHE_MAX_ENTRIES,
+            ttl=Config.WEB_SEARCH_CACHE_TTL if cache_ttl is None else cache_ttl,
+            clock=clock
+        )
+        self.rate_limiter = rate_limiter or TokenBucket(
+            rate=Config.WEB_SEARCH_RATE_PER_MINUTE / 60.0,
+            capacity=Config.WEB_SEARCH_RATE_BURST,
+            clock=clock
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or Config.WEB_SEARCH_WORKERS,
+                                            thread_name_prefix="edubot-search")
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        
+        self.backend_calls = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.rate_limited = 0
+        self.errors = 0
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize case and whitespace so trivially different queries share a key."""
+        return " ".join(query.lower().split())
+    
+    def search(self, query: str, max_results: int = None,
+               timeout: Optional[float] = None) -> List[Dict[str, str]]:
+        """Return results for ``query`` within the latency budget.
+        
+        Raises ``TimeoutError`` when the budget runs out, ``SearchRateLimited``
+        when no request slot frees up in time, or the backend's own error.
+        """
+        max_results = max_results or Config.MAX_SEARCH_RESULTS
+        timeout = self.latency_budget if timeout is None else timeout
+        key = (self.normalize_query(query), max_results)
+        cache_key = f"{max_results}:{key[0]}"
+        
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._fetch, key, cache_key, query, max_results)
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+        
+        try:
+            return list(future.result(timeout=timeout))
+        except FutureTimeout:
+            self.timeouts += 1
+            raise TimeoutError(f"Web search exceeded {timeout:.1f}s budget")
+    
+    def _fetch(self, key: tuple, cache_key: str, query: str,
+               max_results: int) -> List[Dict[str, str]]:
+        """Run one backend call and publish its result to the cache."""
+        try:
+            if not self.rate_limiter.acquire(timeout=self.latency_budget):
+                self.rate_limited += 1
+                raise SearchRateLimited("Web search rate limit reached")
+            
+            self.backend_calls += 1
+            try:
+                results = self.backend.search(query, max_results)
+            except Exception:
+                self.errors += 1
+                raise
+            
+            self.cache.set(cache_key, results)
+            return results
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters plus coalescing, timeout and limiter counts."""
+        return dict(
+            self.cache.stats(),
+            backend_calls=self.backend_calls,
+            coalesced=self.coalesced,
+            timeouts=self.timeouts,
+            rate_limited=self.rate_limited,
+            errors=self.errors
+        )
+
+_service: Optional[SearchService] = None
+_service_lock = threading.Lock()
+
+def get_search_service() -> SearchService:
+    """Return the process-wide search service, shared by all sessions."""
+    global _service
+    
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SearchService(DuckDuckGoBackend())
+    return _service
+
+def set_search_service(service: Optional[SearchService]) -> None:
+    """Replace the process-wide search service, e.g. with a fake backend."""
+    global _service
+    
+    with _service_lock:
+        _service = service
+
 class WebSearcher:
     """Handle web search functionality."""
     
@@ -18,25 +192,36 @@ class WebSearcher:
         return WEB_SEARCH_SUPPORT
     
     @staticmethod
-    def search_web(query: str, max_results: int = None) -> List[Dict[str, str]]:
-        """Search the web using DuckDuckGo."""
+    def search_web(query: str, max_results: int = None,
+                   fetch_pages: bool = None) -> List[Dict[str, str]]:
+        """Search the web, returning no results if the latency budget runs out.
+        
+        With ``fetch_pages`` the top result pages are downloaded concurrently
+        and their most relevant passages attached as ``passages``; search and
+        fetching together stay within ``Config.WEB_FETCH_DEADLINE``.
+        """
         max_results = max_results or Config.MAX_SEARCH_RESULTS
+        fetch_pages = Config.WEB_FETCH_PAGES if fetch_pages is None else fetch_pages
         
         try:
-            if not WEB_SEARCH_SUPPORT:
+            if not WEB_SEARCH_SUPPORT and _service is None:
                 return [{"title": "Web Search Not Available", 
                         "body": "Please install duckduckgo-search: pip install duckduckgo-search",
                         "href": ""}]
             
-            with DDGS() as ddgs:
-                results = []
-                for r in ddgs.text(query, max_results=max_results):
-                    results.append({
-                        "title": r.get("title", ""),
-                        "body": r.get("body", ""),
-                        "href": r.get("href", "")
-                    })
-                return results
+            service = get_search_service()
+            if not fetch_pages:
+                return service.search(query, max_results)
+            
+            deadline = time.monotonic() + Config.WEB_FETCH_DEADLINE
+            results = service.search(query, max_results,
+                                     timeout=min(service.latency_budget, Config.WEB_FETCH_DEADLINE))
+            
+            from processors.page_fetcher import get_page_fetcher
+            return get_page_fetcher().add_passages(query, results, deadline)
+        except (TimeoutError, SearchRateLimited):
+            # Answer without web results rather than stall the turn
+            return []
         except Exception as e:
             return [{"title": "Search Error", 
                     "body": f"Error searching web: {str(e)}",
@@ -49,7 +234,9 @@ class WebSearcher:
         for i, result in enumerate(results, 1):
             formatted += f"{i}. **{result['title']}**\n"
             formatted += f"   {result['body']}\n"
+            for passage in result.get('passages', []):
+                formatted += f"   > {passage}\n"
             if result['href']:
                 formatted += f"   Source: {result['href']}\n"
             formatted += "\n"
-        return formatted
\ No newline at end of file
+        return formatted
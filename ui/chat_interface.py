@@ -1,7 +1,16 @@
 """Chat interface components for EduBot."""
 
+import time
 import streamlit as st
-from utils.helpers import is_academic_question, prepare_context
+from config.settings import Config
+from utils.helpers import (is_academic_question, prepare_context, should_search_web,
+                           wants_document_summary)
+from utils.answer_cache import get_answer_cache
+from utils.history import api_summarizer
+from api.async_gemini_client import AsyncGeminiAPI
+from api.context_cache import get_context_cache
+from api.document_summarizer import get_document_summarizer
+from api.router import get_router
 
 def display_chat_history() -> None:
     """Display the chat conversation."""
@@ -35,45 +44,170 @@ def handle_user_input(user_input: str) -> None:
         st.warning("⚠️ EduBot is designed for academic and educational questions only.")
         return
     
+    # Only self-contained questions (first turn) are looked up and stored
+    is_standalone = not st.session_state.conversation_history
     st.session_state.conversation_history.append({"role": "user", "content": user_input})
     
+    # Serve paraphrases of already answered questions without an API call
+    answer_cache = get_answer_cache()
+    use_answer_cache = (answer_cache is not None and is_standalone
+                        and _is_context_free(user_input))
+    if use_answer_cache:
+        cached_answer = answer_cache.lookup(user_input)
+        if cached_answer is not None:
+            st.session_state.conversation_history.append({
+                "role": "assistant",
+                "content": cached_answer
+            })
+            return
+    
+    # Documents in a context cache entry are not re-sent with every turn
+    context_cache = _active_context_cache()
+    
+    # Whole-document questions on long documents get section summaries
+    summaries = None
+    if _wants_map_reduce(user_input):
+        summaries = _summarize_documents()
+        if summaries is not None:
+            # The summaries stand in for the full text, cached or not
+            context_cache = None
+    
     # Prepare context with documents and web search
     enhanced_input = prepare_context(
         st.session_state.uploaded_documents,
         user_input,
-        st.session_state.web_search_enabled
+        st.session_state.web_search_enabled,
+        include_documents=context_cache is None,
+        document_context=summaries
     )
     
     # Prepare messages for API
     messages = _prepare_messages_for_api(enhanced_input)
     
     # Handle image context
-    image_data = None
-    if st.session_state.uploaded_images:
-        image_data = st.session_state.uploaded_images[0]['base64_data']
+    images = _select_images(st.session_state.uploaded_images)
+    
+    # Pick the model and output cap for this request
+    route = None
+    if Config.ROUTER_ENABLED:
+        route = get_router().route(
+            user_input,
+            images=len(images),
+            documents=len(st.session_state.uploaded_documents),
+            pinned_model=context_cache["model"] if context_cache is not None else None
+        )
+    if summaries is not None and route is not None:
+        route = route._replace(max_tokens=Config.SUMMARY_REDUCE_MAX_TOKENS,
+                               reason=route.reason + ",document_summary")
     
     # Generate response
-    _generate_and_display_response(messages, image_data)
+    response = _generate_and_display_response(messages, images, context_cache, route)
+    
+    if use_answer_cache and response["success"]:
+        answer_cache.add(user_input, response["answer"])
 
-def _prepare_messages_for_api(enhanced_input: str) -> list:
-    """Prepare messages for API call."""
-    messages = []
+def _is_context_free(user_input: str) -> bool:
+    """Check that the answer depends only on the question text."""
+    return not (st.session_state.uploaded_documents or
+                st.session_state.uploaded_images or
+                (st.session_state.web_search_enabled and should_search_web(user_input)))
+
+def _active_context_cache() -> dict:
+    """Return the session's context cache handle, refreshing it if needed."""
+    handle = st.session_state.context_cache
+    if handle is None:
+        return None
+    
+    handle = get_context_cache().ensure(handle)
+    if handle is None:
+        # Entry expired or could not be refreshed: inline documents again
+        st.session_state.context_cache = None
+    return handle
+
+def _wants_map_reduce(user_input: str) -> bool:
+    """Check for a summary request over documents too long for passage selection."""
+    documents = st.session_state.uploaded_documents
+    return (bool(documents) and AsyncGeminiAPI.is_supported()
+            and wants_document_summary(user_input)
+            and get_document_summarizer().needs_map_reduce(documents))
+
+def _summarize_documents() -> str:
+    """Summarize every section of the uploaded documents, showing progress.
+    
+    Returns None if no section could be summarized, so the turn falls back
+    to the context cache or selected passages.
+    """
+    progress = st.progress(0.0, text="📖 Reading your documents section by section...")
+    
+    def on_progress(done: int, total: int, title: str) -> None:
+        progress.progress(done / total if total else 1.0,
+                          text=f"📖 Summarized {done} of {total} sections ({title})")
+    
+    summarizer = get_document_summarizer()
+    summaries = summarizer.summarize(st.session_state.uploaded_documents,
+                                     client_id=st.session_state.api_client.client_id,
+                                     on_progress=on_progress)
+    progress.empty()
+    
+    if not any(summary.summary for summary in summaries):
+        st.warning("⚠️ Could not summarize the documents section by section.")
+        return None
+    return ("Section-by-section summaries of the full documents, in order:\n"
+            + summarizer.format_summaries(summaries))
+
+def _select_images(uploaded_images: list) -> list:
+    """Pick the images to attach, within the per-request count and byte caps."""
+    images = []
+    total_bytes = 0
     
-    # Include recent conversation history (last 10 messages)
-    recent_history = st.session_state.conversation_history[-11:-1]
-    for msg in recent_history:
-        messages.append(msg)
+    for img in uploaded_images:
+        if len(images) >= Config.MAX_IMAGES_PER_REQUEST:
+            break
+        if total_bytes + len(img['data']) > Config.MAX_IMAGE_BYTES_PER_REQUEST:
+            continue
+        images.append({"data": img['data'], "mime_type": img.get('mime_type', "image/jpeg")})
+        total_bytes += len(img['data'])
     
-    messages.append({"role": "user", "content": enhanced_input})
-    return messages
+    if len(images) < len(uploaded_images):
+        st.info(f"ℹ️ Sending {len(images)} of {len(uploaded_images)} images "
+                f"(limit {Config.MAX_IMAGES_PER_REQUEST} images, "
+                f"{Config.MAX_IMAGE_BYTES_PER_REQUEST // (1024 * 1024)} MB per request).")
+    
+    return images
+
+def _prepare_messages_for_api(enhanced_input: str) -> list:
+    """Prepare messages for API call."""
+    # Recent turns under the token budget; older ones arrive as a summary
+    return st.session_state.history_manager.build_messages(
+        st.session_state.conversation_history[:-1],
+        enhanced_input,
+        summarizer=api_summarizer(st.session_state.api_client)
+    )
 
-def _generate_and_display_response(messages: list, image_data: str = None) -> None:
+def _generate_and_display_response(messages: list, images: list = None,
+                                   context_cache: dict = None, route=None) -> dict:
     """Generate and display AI response."""
-    with st.spinner("🤔 EduBot is thinking..."):
-        response = st.session_state.api_client.generate_response(
-            messages=messages,
-            image_data=image_data
-        )
+    options = {}
+    if route is not None:
+        options = {"model": route.model, "max_tokens": route.max_tokens}
+    if context_cache is not None:
+        options.update(model=context_cache["model"], cached_content=context_cache["name"])
+    
+    started = time.perf_counter()
+    if Config.STREAM_RESPONSES:
+        response = _stream_response(messages, images, **options)
+    else:
+        with st.spinner("🤔 EduBot is thinking..."):
+            response = st.session_state.api_client.generate_response(
+                messages=messages,
+                images=images,
+                **options
+            )
+    
+    latency = time.perf_counter() - started
+    st.session_state.history_manager.record_turn(messages, response, latency)
+    if route is not None:
+        get_router().record(route, response, latency)
     
     if response["success"]:
         st.session_state.conversation_history.append({
@@ -81,8 +215,36 @@ def _generate_and_display_response(messages: list, image_data: str = None) -> No
             "content": response["answer"]
         })
         
-        if "usage" in response:
+        if "usage" in response and not response.get("cached"):
             st.session_state.total_tokens += response["usage"].get("totalTokenCount", 0)
         
     else:
-        st.error(f"❌ Error: {response.get('error', 'Unknown error occurred')}")
\ No newline at end of file
+        st.error(f"❌ Error: {response.get('error', 'Unknown error occurred')}")
+    
+    return response
+
+def _stream_response(messages: list, images: list = None, **options) -> dict:
+    """Render response chunks progressively in the assistant chat bubble."""
+    api_client = st.session_state.api_client
+    
+    with st.chat_message("user", avatar="👤"):
+        st.write(st.session_state.conversation_history[-1]["content"])
+    
+    with st.chat_message("assistant", avatar="🤖"):
+        placeholder = st.empty()
+        placeholder.markdown("🤔 EduBot is thinking...")
+        
+        text = ""
+        for chunk in api_client.generate_response_stream(messages=messages,
+                                                         images=images,
+                                                         **options):
+            text += chunk
+            placeholder.markdown(text + "▌")
+        
+        response = api_client.last_stream_result
+        if response.get("success"):
+            placeholder.markdown(response["answer"])
+        else:
+            placeholder.empty()
+    
+    return response
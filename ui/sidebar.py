@@ -2,9 +2,11 @@
 
 import streamlit as st
 from typing import List, Any
+from config.settings import Config
+from api.context_cache import get_context_cache
 from processors.document_processor import DocumentProcessor
 from processors.image_processor import ImageProcessor
-from PIL import Image
+from processors.upload_jobs import DONE, FAILED, UploadJob, get_upload_manager
 
 def setup_sidebar() -> None:
     """Setup the simplified sidebar for media uploads only."""
@@ -17,11 +19,18 @@ def setup_sidebar() -> None:
         # Image upload section
         _setup_image_upload()
         
+        # Pick up finished background jobs and show the ones still running
+        _collect_upload_jobs()
+        _display_upload_progress()
+        
         # Display uploaded content
         _display_uploaded_content()
         
         # Clear files button
         _setup_clear_button()
+        
+        # Cache and performance metrics
+        _display_performance_stats()
 
 def _setup_document_upload() -> None:
     """Setup document upload section."""
@@ -34,11 +43,11 @@ def _setup_document_upload() -> None:
         "Upload documents",
         type=['pdf', 'docx', 'xlsx', 'xls', 'csv'],
         accept_multiple_files=True,
-        help="Upload PDF, DOCX, Excel, or CSV files"
+        help="Upload PDF, DOCX, Excel, or CSV files",
+        key=f"document_uploader_{st.session_state.upload_generation}"
     )
     
-    if uploaded_files:
-        process_uploaded_files(uploaded_files)
+    process_uploaded_files(uploaded_files or [])
 
 def _setup_image_upload() -> None:
     """Setup image upload section."""
@@ -51,11 +60,11 @@ def _setup_image_upload() -> None:
         "Upload images",
         type=['png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'],
         accept_multiple_files=True,
-        help="Upload images for analysis"
+        help="Upload images for analysis",
+        key=f"image_uploader_{st.session_state.upload_generation}"
     )
     
-    if uploaded_images:
-        process_uploaded_images(uploaded_images)
+    process_uploaded_images(uploaded_images or [])
 
 def _display_uploaded_content() -> None:
     """Display uploaded content summary."""
@@ -71,65 +80,258 @@ def _display_uploaded_content() -> None:
 
 def _setup_clear_button() -> None:
     """Setup clear files button."""
-    if (st.session_state.uploaded_documents or st.session_state.uploaded_images):
+    if (st.session_state.uploaded_documents or st.session_state.uploaded_images
+            or st.session_state.upload_jobs):
         if st.button("🗑️ Clear All Files"):
+            for job in st.session_state.upload_jobs.values():
+                job.cancel()
+            st.session_state.upload_jobs = {}
+            # New uploader widgets, so cleared files are not queued again
+            st.session_state.upload_generation += 1
+            if st.session_state.context_cache is not None:
+                get_context_cache().release(st.session_state.context_cache)
+                st.session_state.context_cache = None
             st.session_state.uploaded_documents = []
             st.session_state.uploaded_images = []
             st.rerun()
 
+def _display_performance_stats() -> None:
+    """Display process-wide cache metrics."""
+    from api.response_cache import get_response_cache
+    from api.scheduler import get_scheduler
+    from api.resilience import get_resilience
+    from api.router import get_router
+    from api.document_summarizer import get_document_summarizer
+    from utils.answer_cache import get_answer_cache
+    from processors.document_cache import get_document_cache
+    from processors.web_searcher import get_search_service
+    from processors.page_fetcher import get_page_fetcher
+    from utils.helpers import session_memory_usage
+    
+    with st.expander("📊 Performance"):
+        usage = session_memory_usage(st.session_state)
+        st.caption(
+            f"This session: {usage['total'] / 1e6:.1f} MB "
+            f"(chat {usage['history'] / 1e6:.1f} MB, documents {usage['documents'] / 1e6:.1f} MB, "
+            f"images {usage['images'] / 1e6:.1f} MB)"
+        )
+        
+        history = st.session_state.history_manager.stats()
+        if history['last'] is not None:
+            last = history['last']
+            reported = last['prompt_tokens'] or "n/a"
+            st.caption(
+                f"Last turn: ~{last['estimated_tokens']} prompt tokens (API: {reported}), "
+                f"{last['latency']:.1f}s; session average {history['avg_prompt_tokens']:.0f} "
+                f"tokens, {history['avg_latency']:.1f}s; "
+                f"{history['summarized_messages']} earlier messages summarized"
+            )
+        
+        stats = get_scheduler().stats()
+        st.caption(
+            f"Gemini queue: {stats['queue_depth']} waiting (max {stats['max_queue_depth']}), "
+            f"wait avg {stats['avg_wait']:.1f}s / p95 {stats['p95_wait']:.1f}s, "
+            f"{stats['coalesced']} coalesced, {stats['rejected'] + stats['expired']} turned away"
+        )
+        
+        stats = get_router().stats()
+        if stats['routes']:
+            routes = ", ".join(f"{route} {count}" for route, count in sorted(stats['routes'].items()))
+            st.caption(f"Model routing: {routes}; {stats['shifted']} shifted off degraded models")
+        
+        stats = get_resilience().stats()
+        breakers = ", ".join(f"{model} {info['state']}" for model, info in stats['models'].items())
+        st.caption(
+            f"Hedging: {stats['hedge_rate']:.0%} of requests hedged, hedge won "
+            f"{stats['win_rate']:.0%}; {stats['fallbacks']} fallbacks"
+            + (f"; breakers: {breakers}" if breakers else "")
+        )
+        
+        for tier, stats in get_response_cache().stats().items():
+            st.caption(
+                f"Response cache ({tier}): {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} entries"
+            )
+        
+        for tier, stats in get_document_cache().stats().items():
+            st.caption(
+                f"Document cache ({tier}): {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} entries"
+            )
+        
+        answer_cache = get_answer_cache()
+        if answer_cache is not None:
+            stats = answer_cache.stats()
+            st.caption(
+                f"Answer cache: {stats['hits']} hits / {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%}), {stats['entries']} entries"
+            )
+        
+        stats = get_search_service().stats()
+        st.caption(
+            f"Search cache: {stats['hits']} hits / {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%}), {stats['coalesced']} coalesced, "
+            f"{stats['timeouts']} timed out"
+        )
+        
+        stats = get_context_cache().stats()
+        st.caption(
+            f"Context cache: {stats['entries']} document sets "
+            f"({stats['cached_tokens']} tokens), {stats['created']} created, "
+            f"{stats['refreshed']} refreshed, {stats['failures']} failures"
+        )
+        
+        stats = get_page_fetcher().stats()
+        st.caption(
+            f"Result pages: {stats['fetched']} fetched, {stats['dropped']} dropped "
+            f"at deadline, {stats['failed']} failed"
+        )
+        
+        stats = get_upload_manager().stats()
+        st.caption(
+            f"Uploads: {stats['active']} processing, {stats['completed']} done, "
+            f"{stats['failed']} failed, {stats['cancelled']} cancelled"
+        )
+        
+        stats = get_document_summarizer().stats()
+        if stats['runs']:
+            st.caption(
+                f"Document summaries: {stats['sections']} sections, {stats['cache_hits']} "
+                f"from cache, {stats['calls']} calls ({stats['failures']} failed), "
+                f"last run {stats['last_seconds']:.1f}s"
+            )
+
 def process_uploaded_files(uploaded_files: List[Any]) -> None:
-    """Process uploaded files and extract content."""
-    processor = DocumentProcessor()
+    """Queue new document uploads for background processing."""
+    manager = get_upload_manager()
+    jobs = st.session_state.upload_jobs
     
     for uploaded_file in uploaded_files:
-        if any(doc['name'] == uploaded_file.name for doc in st.session_state.uploaded_documents):
+        file_id = _upload_id(uploaded_file)
+        if file_id in jobs or any(doc.get('file_id') == file_id
+                                  for doc in st.session_state.uploaded_documents):
             continue
         
         file_type = uploaded_file.name.split('.')[-1].lower()
+        jobs[file_id] = manager.submit_document(uploaded_file, file_type, file_id)
+    
+    _cancel_removed_uploads("document", uploaded_files)
+
+def _cancel_removed_uploads(kind: str, uploaded_files: List[Any]) -> None:
+    """Cancel unfinished jobs whose file was removed from the uploader."""
+    current = {_upload_id(uploaded_file) for uploaded_file in uploaded_files}
+    jobs = st.session_state.upload_jobs
+    for file_id, job in list(jobs.items()):
+        if job.kind == kind and not job.done and file_id not in current:
+            job.cancel()
+            del jobs[file_id]
+
+def _collect_upload_jobs() -> None:
+    """Move the results of finished background jobs into the session."""
+    added = False
+    
+    for job in st.session_state.upload_jobs.values():
+        if job.collected or not job.done:
+            continue
+        job.collected = True
         
-        try:
-            content = processor.process_file(uploaded_file, file_type)
-            
-            st.session_state.uploaded_documents.append({
-                'name': uploaded_file.name,
-                'type': file_type,
-                'content': content,
-                'size': getattr(uploaded_file, 'size', 0)
-            })
-            
-            st.success(f"✅ Processed: {uploaded_file.name}")
-            
-        except Exception as e:
-            st.error(f"❌ Error processing {uploaded_file.name}: {str(e)}")
+        if job.status == DONE and job.kind == "document":
+            added |= _add_document(job, job.result())
+        elif job.status == DONE:
+            _add_image(job, job.result())
+        elif job.status == FAILED:
+            st.error(f"❌ Error processing {job.name}: {job.error}")
+        job.release()
+    
+    if added:
+        _sync_context_cache()
+
+def _add_document(job: UploadJob, result: dict) -> bool:
+    """Add a processed document unless the same content is already uploaded."""
+    # Same content uploaded again under another name
+    if result['hash'] and any(doc.get('hash') == result['hash']
+                              for doc in st.session_state.uploaded_documents):
+        return False
+    
+    st.session_state.uploaded_documents.append({
+        'name': job.name,
+        'type': job.file_type,
+        'content': result['content'],
+        'index': result['index'],
+        'hash': result['hash'],
+        'file_id': job.file_id,
+        'size': job.size
+    })
+    
+    st.success(f"✅ Processed: {job.name}")
+    return True
+
+def _add_image(job: UploadJob, result: dict) -> None:
+    """Add a processed image and show its preview."""
+    st.session_state.uploaded_images.append({
+        'name': job.name,
+        'file_id': job.file_id,
+        'data': result['image_bytes'],
+        'mime_type': result['mime_type'],
+        'original_size': result['original_size'],
+        'processed_size': result['processed_size'],
+        'file_size': result['file_size'],
+        'format': result['format']
+    })
+    
+    st.success(f"✅ Processed: {job.name}")
+    
+    st.image(result['preview'], caption=job.name, width=200)
+
+def _display_upload_progress() -> None:
+    """Show per-file progress, polling while background jobs are running."""
+    if all(job.done for job in st.session_state.upload_jobs.values()):
+        return
+    
+    fragment = getattr(st, "fragment", None)
+    if fragment is None:
+        # Older Streamlit: results are picked up on the next interaction
+        _upload_progress_panel()
+    else:
+        fragment(run_every=Config.UPLOAD_POLL_INTERVAL)(_upload_progress_panel)()
+
+def _upload_progress_panel() -> None:
+    """Render a progress bar per pending file; rerun the app once any finishes."""
+    jobs = list(st.session_state.upload_jobs.values())
+    if any(job.done and not job.collected for job in jobs):
+        st.rerun()
+    
+    for job in jobs:
+        if not job.done:
+            st.progress(job.progress, text=f"⏳ {job.name}: {job.stage}")
+
+def _sync_context_cache() -> None:
+    """Point the session at a Gemini context cache entry for its current documents."""
+    manager = get_context_cache()
+    previous = st.session_state.context_cache
+    
+    with st.spinner("Caching documents for follow-up questions..."):
+        handle = manager.acquire(st.session_state.uploaded_documents, Config.DEFAULT_MODEL)
+    
+    if previous is not None:
+        manager.release(previous)
+    st.session_state.context_cache = handle
+
+def _upload_id(uploaded_file: Any) -> str:
+    """Identify an upload without hashing it, so reruns skip it cheaply."""
+    file_id = getattr(uploaded_file, 'file_id', None)
+    return file_id or f"{uploaded_file.name}:{getattr(uploaded_file, 'size', 0)}"
 
 def process_uploaded_images(uploaded_images: List[Any]) -> None:
-    """Process uploaded images."""
-    processor = ImageProcessor()
+    """Queue new image uploads for background processing."""
+    manager = get_upload_manager()
+    jobs = st.session_state.upload_jobs
     
+    seen_ids = {img.get('file_id') for img in st.session_state.uploaded_images}
     for uploaded_image in uploaded_images:
-        if any(img['name'] == uploaded_image.name for img in st.session_state.uploaded_images):
+        file_id = _upload_id(uploaded_image)
+        if file_id in jobs or file_id in seen_ids:
             continue
-        
-        try:
-            result = processor.process_image(uploaded_image)
-            
-            if result['success']:
-                st.session_state.uploaded_images.append({
-                    'name': uploaded_image.name,
-                    'base64_data': result['base64_data'],
-                    'original_size': result['original_size'],
-                    'processed_size': result['processed_size'],
-                    'file_size': result['file_size'],
-                    'format': result['format']
-                })
-                
-                st.success(f"✅ Processed: {uploaded_image.name}")
-                
-                image = Image.open(uploaded_image)
-                st.image(image, caption=uploaded_image.name, width=200)
-                
-            else:
-                st.error(f"❌ Error processing {uploaded_image.name}: {result['error']}")
-            
-        except Exception as e:
-            st.error(f"❌ Error processing {uploaded_image.name}: {str(e)}")
\ No newline at end of file
+        jobs[file_id] = manager.submit_image(uploaded_image, file_id)
+    
+    _cancel_removed_uploads("image", uploaded_images)
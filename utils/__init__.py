@@ -3,13 +3,28 @@
 from .helpers import (
     is_academic_question, 
     prepare_context, 
+    select_document_context,
+    estimate_tokens,
     should_search_web, 
+    wants_document_summary,
+    session_memory_usage,
     initialize_session_state
 )
+from .classifier import RuleClassifier, Classification, academic_classifier, web_search_classifier
+from .history import HistoryManager
 
 __all__ = [
     'is_academic_question', 
     'prepare_context', 
+    'select_document_context',
+    'estimate_tokens',
     'should_search_web', 
-    'initialize_session_state'
+    'wants_document_summary',
+    'session_memory_usage',
+    'initialize_session_state',
+    'RuleClassifier',
+    'Classification',
+    'academic_classifier',
+    'web_search_classifier',
+    'HistoryManager'
 ]
\ No newline at end of file
@@ -0,0 +1,206 @@
+"""Near-duplicate question cache using MinHash signatures and LSH banding."""
+
+import re
+import threading
+import zlib
+from typing import Dict, Any, FrozenSet, List, Optional
+from config.settings import Config
+
+try:
+    import numpy as np
+    ANSWER_CACHE_SUPPORT = True
+except ImportError:
+    ANSWER_CACHE_SUPPORT = False
+
+# Words that change how a question is phrased but not what is being asked
+FILLER_WORDS = frozenset([
+    'a', 'an', 'the', 'please', 'pls', 'plz', 'can', 'could', 'would', 'you',
+    'me', 'i', 'want', 'to', 'know', 'tell', 'about', 'explain', 'describe',
+    'define', 'definition', 'meaning', 'what', 'whats', 'is', 'are', 'of',
+    'give', 'us', 'briefly', 'kindly', 'hi', 'hello', 'thanks'
+])
+
+# Words, numbers and the operators that change what a math question asks
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+|[+\-*/^=<>]')
+SYMBOL_PATTERN = re.compile(r'\d|[+\-*/^=<>]')
+
+class AnswerCache:
+    """Serve cached answers for paraphrases of previously answered questions.
+    
+    Questions are normalized, shingled into character n-grams and reduced to
+    MinHash signatures. Signatures are split into bands whose hashes index a
+    bucket table, so a lookup only compares against a handful of candidates
+    regardless of how many entries are cached.
+    
+    Character similarity only finds candidates. "Advantages" and
+    "disadvantages", or "(x+1)^2" and "(x-1)^2", are a few characters apart
+    yet need different answers, so a hit also needs the content words to
+    match (word-level Jaccard of at least ``threshold``) and the numbers and
+    operators to match exactly.
+    """
+    
+    def __init__(self, threshold: float = None, max_entries: int = None,
+                 num_perm: int = 64, bands: int = 8, ngram: int = 3) -> None:
+        """Initialize the index with a fixed-capacity ring of slots."""
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        
+        self.threshold = threshold or Config.ANSWER_CACHE_THRESHOLD
+        self.capacity = max_entries or Config.ANSWER_CACHE_MAX_ENTRIES
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        
+        # Random odd 64-bit multipliers for multiply-shift hashing
+        rng = np.random.RandomState(1)
+        self._perm_a = rng.randint(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._perm_b = rng.randint(0, 2**63, num_perm, dtype=np.uint64)
+        self._band_mix = rng.randint(0, 2**63, self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        
+        self._band_keys = np.zeros((self.capacity, bands), dtype=np.uint64)
+        self._answers: List[Optional[str]] = [None] * self.capacity
+        self._words: List[Optional[FrozenSet[str]]] = [None] * self.capacity
+        self._symbols: List[Optional[str]] = [None] * self.capacity
+        self._buckets: Dict[int, Any] = {}
+        self._next_slot = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def normalize(self, question: str) -> str:
+        """Lowercase, strip punctuation except math operators and drop filler words."""
+        words = TOKEN_PATTERN.findall(question.lower())
+        return " ".join(word for word in words if word not in FILLER_WORDS)
+    
+    @staticmethod
+    def symbols(text: str) -> str:
+        """Return the numbers and operators of normalized text, in order."""
+        return " ".join(token for token in text.split() if SYMBOL_PATTERN.search(token))
+    
+    def _signature(self, text: str) -> "np.ndarray":
+        """Return the MinHash signature of ``text``'s character n-grams."""
+        padded = f" {text} "
+        shingles = {padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1)}
+        hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        
+        # Multiply-shift hashing; uint64 overflow wraps by design
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(self._perm_a, hashes) + self._perm_b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+    
+    def _bands_of(self, signature: "np.ndarray") -> "np.ndarray":
+        """Hash each band of a signature into a single bucket key."""
+        rows = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        with np.errstate(over='ignore'):
+            keys = (rows * self._band_mix).sum(axis=1)
+            keys ^= np.arange(self.bands, dtype=np.uint64) << np.uint64(56)
+        return keys
+    
+    def lookup(self, question: str) -> Optional[str]:
+        """Return a cached answer for a near-duplicate question, if any."""
+        text = self.normalize(question)
+        if len(text) < Config.ANSWER_CACHE_MIN_CHARS:
+            return None
+        
+        signature = self._signature(text)
+        band_keys = self._bands_of(signature).tolist()
+        words = frozenset(text.split())
+        symbols = self.symbols(text)
+        
+        with self._lock:
+            candidates = set()
+            for key in band_keys:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    continue
+                if isinstance(bucket, int):
+                    candidates.add(bucket)
+                else:
+                    candidates.update(bucket)
+            
+            best_slot, best_score = None, 0.0
+            for slot in candidates:
+                if self._symbols[slot] != symbols:
+                    continue
+                score = len(words & self._words[slot]) / len(words | self._words[slot])
+                if score > best_score:
+                    best_slot, best_score = slot, score
+            
+            if best_slot is not None and best_score >= self.threshold:
+                self.hits += 1
+                return self._answers[best_slot]
+            
+            self.misses += 1
+            return None
+    
+    def add(self, question: str, answer: str) -> None:
+        """Index ``answer`` under ``question``, evicting the oldest entry when full."""
+        text = self.normalize(question)
+        if len(text) < Config.ANSWER_CACHE_MIN_CHARS:
+            return
+        
+        signature = self._signature(text)
+        band_keys = self._bands_of(signature)
+        
+        with self._lock:
+            slot = self._next_slot
+            if self._answers[slot] is not None:
+                self._unindex(slot)
+            else:
+                self._size += 1
+            
+            self._band_keys[slot] = band_keys
+            self._answers[slot] = answer
+            self._words[slot] = frozenset(text.split())
+            self._symbols[slot] = self.symbols(text)
+            for key in band_keys.tolist():
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    self._buckets[key] = slot
+                elif isinstance(bucket, int):
+                    self._buckets[key] = [bucket, slot]
+                else:
+                    bucket.append(slot)
+            
+            self._next_slot = (slot + 1) % self.capacity
+    
+    def _unindex(self, slot: int) -> None:
+        """Remove ``slot`` from every bucket it belongs to."""
+        for key in self._band_keys[slot].tolist():
+            bucket = self._buckets.get(key)
+            if bucket == slot:
+                del self._buckets[key]
+            elif isinstance(bucket, list):
+                bucket.remove(slot)
+                if len(bucket) == 1:
+                    self._buckets[key] = bucket[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": self._size
+        }
+
+_answer_cache: Optional[AnswerCache] = None
+_answer_cache_lock = threading.Lock()
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """Return the process-wide answer cache, or None when it is unavailable."""
+    global _answer_cache
+    
+    if not (ANSWER_CACHE_SUPPORT and Config.ANSWER_CACHE_ENABLED):
+        return None
+    
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache()
+    return _answer_cache
@@ -0,0 +1,108 @@
+"""Precompiled single-pass rule classifiers for user messages."""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from config.settings import Config
+
+class Classification(NamedTuple):
+    """Result of classifying one message."""
+    matched: bool
+    rule: Optional[str] = None
+    match: Optional[str] = None
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation factored by common prefixes.
+    
+    ``re`` tries alternatives one by one, so a flat ``a|b|c`` list costs one
+    attempt per keyword at every position. Factoring shared prefixes turns
+    that into a single walk down a character trie.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if terminal else body
+    
+    return build(trie)
+
+class RuleClassifier:
+    """Match a message against an ordered list of precompiled rules.
+    
+    Every rule is compiled once at import. Keyword lists are folded into a
+    single prefix-factored regex, so the whole list is checked in one scan
+    instead of one substring search per keyword. Keywords keep plain
+    substring semantics. Rules are tried in order and the first match is
+    reported, so ``rule`` explains why a message was accepted.
+    
+    The rules are deliberately not merged into one big alternation: CPython's
+    ``re`` can only skip ahead quickly when a pattern starts with a known
+    character set, and a mixed alternation loses that and runs slower.
+    """
+    
+    def __init__(self, keywords: Dict[str, Iterable[str]],
+                 patterns: Optional[Dict[str, str]] = None,
+                 short_length: Optional[int] = None) -> None:
+        """Compile ``keywords`` (rule -> words) and ``patterns`` (rule -> regex)."""
+        rules = [(rule, trie_pattern(words)) for rule, words in keywords.items()]
+        rules += list((patterns or {}).items())
+        
+        self.rules = [(rule, re.compile(pattern).search) for rule, pattern in rules]
+        self.short_length = short_length
+    
+    def classify(self, text: str) -> Classification:
+        """Classify one message and explain which rule matched."""
+        text_lower = text.lower()
+        for rule, search in self.rules:
+            found = search(text_lower)
+            if found:
+                return Classification(True, rule, found.group())
+        
+        if self.short_length is not None and len(text.strip()) < self.short_length:
+            return Classification(True, "short_question", text.strip())
+        
+        return Classification(False)
+    
+    def classify_batch(self, texts: List[str]) -> List[Classification]:
+        """Classify many messages, e.g. for offline moderation of chat logs."""
+        classify = self.classify
+        return [classify(text) for text in texts]
+
+# Mathematical expressions
+MATH_PATTERNS = {
+    "math_expression": r'\d+\s*[\+\-\*\/\=]\s*\d+',
+    "math_variable": r'[xy]\s*[\+\-\*\/\=]',
+    "math_function": r'\b(?:sin|cos|tan|log|ln)\b'
+}
+
+# Code-related patterns
+CODE_PATTERNS = {
+    "code_keyword": r'\b(?:print|return|if|else|for|while|function|def|class|import)\b',
+    "code_symbol": r'[\{\}\[\]\(\);]'
+}
+
+academic_classifier = RuleClassifier(
+    keywords={"academic_keyword": Config.ACADEMIC_KEYWORDS},
+    patterns=dict(MATH_PATTERNS, **CODE_PATTERNS),
+    # Accept short questions as potentially academic
+    short_length=10
+)
+
+web_search_classifier = RuleClassifier(
+    keywords={"search_keyword": Config.WEB_SEARCH_KEYWORDS}
+)
+
+summary_classifier = RuleClassifier(
+    keywords={"summary_keyword": Config.SUMMARY_KEYWORDS}
+)
@@ -1,66 +1,42 @@
 """Helper functions for EduBot."""
 
-import re
-from typing import List, Dict, Any
+import sys
+from typing import List, Dict, Any, Optional
 from config.settings import Config
+from utils.classifier import academic_classifier, summary_classifier, web_search_classifier
 
 def is_academic_question(question: str) -> bool:
     """Check if the question is academic/educational in nature."""
-    question_lower = question.lower()
-    
-    # Check for academic keywords
-    for keyword in Config.ACADEMIC_KEYWORDS:
-        if keyword in question_lower:
-            return True
-    
-    # Check for mathematical expressions
-    math_patterns = [
-        r'\d+\s*[\+\-\*\/\=]\s*\d+',
-        r'[xy]\s*[\+\-\*\/\=]',
-        r'\b(sin|cos|tan|log|ln)\b'
-    ]
-    
-    for pattern in math_patterns:
-        if re.search(pattern, question_lower):
-            return True
-    
-    # Check for code-related patterns
-    code_patterns = [
-        r'\b(print|return|if|else|for|while|function|def|class|import)\b',
-        r'[\{\}\[\]\(\);]'
-    ]
-    
-    for pattern in code_patterns:
-        if re.search(pattern, question_lower):
-            return True
-    
-    # Accept short questions as potentially academic
-    if len(question.strip()) < 10:
-        return True
-    
-    return False
+    return academic_classifier.classify(question).matched
 
 def prepare_context(uploaded_documents: List[Dict], user_input: str, 
-                   web_search_enabled: bool = True) -> str:
-    """Prepare context from uploaded documents and web search."""
+                   web_search_enabled: bool = True, include_documents: bool = True,
+                   document_context: Optional[str] = None) -> str:
+    """Prepare context from uploaded documents and web search.
+    
+    Pass ``include_documents=False`` when the documents already reach the
+    model through a Gemini context cache entry, and ``document_context`` to
+    send prepared text (such as section summaries) instead of passages.
+    """
     context_parts = []
     
-    # Add document context
-    if uploaded_documents:
+    # Add the document passages most relevant to the question
+    if uploaded_documents and include_documents:
         context_parts.append("UPLOADED DOCUMENTS:")
-        for doc in uploaded_documents:
-            context_parts.append(f"\n--- {doc['name']} ({doc['type']}) ---")
-            content = doc['content'][:Config.MAX_DOCUMENT_PREVIEW]
-            context_parts.append(content)
+        if document_context is not None:
+            context_parts.append(document_context)
+        else:
+            context_parts.extend(select_document_context(uploaded_documents, user_input))
         context_parts.append("\n" + "="*50 + "\n")
     
     # Handle web search
     if web_search_enabled and should_search_web(user_input):
         from processors.web_searcher import WebSearcher
         search_results = WebSearcher.search_web(user_input)
-        search_context = WebSearcher.format_search_results(search_results)
-        context_parts.append("WEB SEARCH RESULTS:")
-        context_parts.append(search_context)
+        if search_results:
+            search_context = WebSearcher.format_search_results(search_results)
+            context_parts.append("WEB SEARCH RESULTS:")
+            context_parts.append(search_context)
         context_parts.append("="*50 + "\n")
     
     if context_parts:
@@ -68,16 +44,95 @@ def prepare_context(uploaded_documents: List[Dict], user_input: str,
     else:
         return user_input
 
+def select_document_context(uploaded_documents: List[Dict], user_input: str,
+                            token_budget: int = None) -> List[str]:
+    """Select the top-scoring document chunks for the question under a token budget.
+    
+    Falls back to the leading text of each document when nothing in the
+    question matches the indexed terms (e.g. "summarize this").
+    """
+    from processors.document_index import DocumentIndex
+    
+    token_budget = token_budget or Config.DOCUMENT_CONTEXT_TOKEN_BUDGET
+    
+    candidates = []
+    for doc_number, doc in enumerate(uploaded_documents):
+        if doc.get('index') is None:
+            doc['index'] = DocumentIndex(doc['content'])
+        for chunk_id, score in doc['index'].search(user_input):
+            candidates.append((score, doc_number, chunk_id))
+    candidates.sort(reverse=True)
+    
+    selected: Dict[int, List[int]] = {}
+    used_tokens = 0
+    for score, doc_number, chunk_id in candidates:
+        tokens = estimate_tokens(uploaded_documents[doc_number]['index'].chunk(chunk_id))
+        if used_tokens + tokens > token_budget:
+            continue
+        selected.setdefault(doc_number, []).append(chunk_id)
+        used_tokens += tokens
+    
+    parts = []
+    for doc_number, doc in enumerate(uploaded_documents):
+        if selected:
+            if doc_number not in selected:
+                continue
+            chunks = [doc['index'].chunk(chunk_id) for chunk_id in sorted(selected[doc_number])]
+            content = "\n...\n".join(chunks)
+        else:
+            per_doc_chars = min(Config.MAX_DOCUMENT_PREVIEW,
+                                token_budget * 4 // len(uploaded_documents))
+            content = doc['content'][:per_doc_chars]
+        
+        parts.append(f"\n--- {doc['name']} ({doc['type']}) ---")
+        parts.append(content)
+    
+    return parts
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of text (about 4 characters per token)."""
+    return (len(text) + 3) // 4
+
 def should_search_web(user_input: str) -> bool:
     """Determine if web search should be performed."""
-    search_keywords = ['current', 'latest', 'recent', 'today', 'news', '2024', '2025']
-    return any(keyword in user_input.lower() for keyword in search_keywords)
+    return web_search_classifier.classify(user_input).matched
+
+def wants_document_summary(user_input: str) -> bool:
+    """Determine if the question asks for a summary of the uploaded documents."""
+    return summary_classifier.classify(user_input).matched
+
+def session_memory_usage(session_state: Any) -> Dict[str, int]:
+    """Approximate the bytes held by one session's chat, documents and images.
+    
+    Document text and indexes may be shared with the process-wide document
+    cache, so the per-session figures can overlap across sessions.
+    """
+    history = sum(sys.getsizeof(msg['content'])
+                  for msg in session_state.get('conversation_history', []))
+    
+    documents = 0
+    for doc in session_state.get('uploaded_documents', []):
+        documents += sys.getsizeof(doc['content'])
+        if doc.get('index') is not None:
+            documents += doc['index'].nbytes()
+    
+    images = 0
+    for img in session_state.get('uploaded_images', []):
+        images += len(img.get('data') or b'')
+    
+    return {
+        "history": history,
+        "documents": documents,
+        "images": images,
+        "total": history + documents + images
+    }
 
 def initialize_session_state() -> None:
     """Initialize Streamlit session state variables."""
     import streamlit as st
     from api.gemini_client import GeminiAPI
     from config.settings import Config
+    from utils.history import HistoryManager
     
     if "conversation_history" not in st.session_state:
         st.session_state.conversation_history = []
@@ -97,6 +152,18 @@ def initialize_session_state() -> None:
     if "web_search_enabled" not in st.session_state:
         st.session_state.web_search_enabled = True
     
+    if "history_manager" not in st.session_state:
+        st.session_state.history_manager = HistoryManager()
+    
+    if "context_cache" not in st.session_state:
+        st.session_state.context_cache = None
+    
+    if "upload_jobs" not in st.session_state:
+        st.session_state.upload_jobs = {}
+    
+    if "upload_generation" not in st.session_state:
+        st.session_state.upload_generation = 0
+    
     # Auto-connect if API key is available
     if Config.GEMINI_API_KEY and not st.session_state.api_client:
         try:
@@ -0,0 +1,190 @@
+"""Token-budgeted conversation history with rolling summarization."""
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from config.settings import Config
+from utils.helpers import estimate_tokens
+
+# Per-message framing (role, separators) on top of the text itself
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PROMPT = (
+    "Summarize the earlier part of this tutoring conversation between a student "
+    "and EduBot in at most {words} words. Keep the subjects discussed, key facts, "
+    "formulas and definitions, and any questions the student still has open.\n\n"
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_summary_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for history summaries."""
+    global _executor
+    
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.HISTORY_SUMMARY_WORKERS,
+                                               thread_name_prefix="edubot-summary")
+    return _executor
+
+def api_summarizer(api_client: Any) -> Callable[[str], Optional[str]]:
+    """Build a summarizer that sends the summary prompt through ``api_client``."""
+    from api.scheduler import PRIORITY_BACKGROUND
+    
+    def summarize(prompt: str) -> Optional[str]:
+        response = api_client.generate_response(
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=Config.HISTORY_SUMMARY_TOKENS,
+            temperature=0.3,
+            priority=PRIORITY_BACKGROUND
+        )
+        return response["answer"] if response.get("success") else None
+    return summarize
+
+class HistoryManager:
+    """Pack recent turns under a token budget and summarize the rest.
+    
+    Token estimates are computed once per message and kept in a list that
+    grows with the (append-only) history. Turns that fall out of the window
+    are folded into a summary by a background job; until it finishes, the
+    previous summary is used, so a turn never waits on summarization.
+    """
+    
+    def __init__(self, token_budget: int = None, summary_min_messages: int = None,
+                 summarizer: Optional[Callable[[str], Optional[str]]] = None) -> None:
+        """Initialize an empty history window."""
+        self.token_budget = token_budget or Config.HISTORY_TOKEN_BUDGET
+        self.summary_min_messages = summary_min_messages or Config.HISTORY_SUMMARY_MIN_MESSAGES
+        self.summarizer = summarizer
+        
+        self.summary: Optional[str] = None
+        self.summary_upto = 0
+        self.turns: deque = deque(maxlen=Config.HISTORY_STATS_TURNS)
+        
+        self._tokens: List[int] = []
+        self._future: Optional[Future] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def reset(self) -> None:
+        """Forget cached estimates and the summary, e.g. when the chat is cleared."""
+        with self._lock:
+            self._tokens = []
+            self.summary = None
+            self.summary_upto = 0
+            self.turns.clear()
+            # Results of a summary job started before the reset are discarded
+            self._generation += 1
+    
+    @staticmethod
+    def message_tokens(message: Dict[str, str]) -> int:
+        """Estimate the prompt tokens one message costs."""
+        return estimate_tokens(message['content']) + MESSAGE_OVERHEAD_TOKENS
+    
+    def _sync(self, history: List[Dict[str, str]]) -> None:
+        """Estimate tokens for messages appended since the last call."""
+        if len(self._tokens) > len(history):
+            self.reset()
+        for message in history[len(self._tokens):]:
+            self._tokens.append(self.message_tokens(message))
+    
+    def build_messages(self, history: List[Dict[str, str]], content: str,
+                       summarizer: Optional[Callable[[str], Optional[str]]] = None
+                       ) -> List[Dict[str, str]]:
+        """Return API messages for ``content`` preceded by as much history as fits.
+        
+        ``history`` holds the earlier turns only, oldest first. When older turns
+        were dropped and a summary exists, it is prepended to the first user
+        message so roles still alternate.
+        """
+        self._sync(history)
+        
+        with self._lock:
+            summary = self.summary
+        budget = self.token_budget
+        if summary:
+            budget -= estimate_tokens(summary)
+        
+        start = len(history)
+        used = 0
+        while start > 0 and used + self._tokens[start - 1] <= budget:
+            start -= 1
+            used += self._tokens[start]
+        
+        # The window has to open with a user turn
+        while start < len(history) and history[start]['role'] != 'user':
+            start += 1
+        
+        self._maybe_summarize(history, start, summarizer or self.summarizer)
+        
+        messages = [{"role": msg['role'], "content": msg['content']} for msg in history[start:]]
+        messages.append({"role": "user", "content": content})
+        
+        if summary and start > 0:
+            messages[0]['content'] = (f"Summary of the earlier conversation:\n{summary}\n\n"
+                                      + messages[0]['content'])
+        return messages
+    
+    def _maybe_summarize(self, history: List[Dict[str, str]], start: int,
+                         summarizer: Optional[Callable[[str], Optional[str]]]) -> None:
+        """Start a background summary once enough turns have left the window."""
+        if summarizer is None or start - self.summary_upto < self.summary_min_messages:
+            return
+        
+        with self._lock:
+            if self._future is not None and not self._future.done():
+                return
+            folded = list(history[self.summary_upto:start])
+            self._future = get_summary_executor().submit(
+                self._summarize, summarizer, self.summary, folded, start, self._generation
+            )
+    
+    def _summarize(self, summarizer: Callable[[str], Optional[str]],
+                   previous: Optional[str], folded: List[Dict[str, str]],
+                   upto: int, generation: int) -> None:
+        """Fold ``folded`` turns into the running summary."""
+        limit = Config.HISTORY_SUMMARY_MESSAGE_CHARS
+        prompt = SUMMARY_PROMPT.format(words=Config.HISTORY_SUMMARY_TOKENS * 3 // 4)
+        if previous:
+            prompt += f"Summary so far:\n{previous}\n\n"
+        prompt += "Conversation:\n"
+        for message in folded:
+            speaker = "Student" if message['role'] == 'user' else "EduBot"
+            prompt += f"{speaker}: {message['content'][:limit]}\n"
+        
+        try:
+            summary = summarizer(prompt)
+        except Exception:
+            summary = None
+        
+        if summary:
+            with self._lock:
+                if generation == self._generation:
+                    self.summary = summary.strip()
+                    self.summary_upto = upto
+    
+    def record_turn(self, messages: List[Dict[str, str]], response: Dict[str, Any],
+                    latency: float) -> None:
+        """Record estimated and reported prompt tokens and latency for one turn."""
+        usage = response.get('usage') or {}
+        self.turns.append({
+            "estimated_tokens": sum(self.message_tokens(msg) for msg in messages),
+            "prompt_tokens": usage.get('promptTokenCount'),
+            "latency": latency,
+            "cached": bool(response.get('cached'))
+        })
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the last turn's figures, session averages and summary coverage."""
+        turns = [turn for turn in self.turns if not turn['cached']]
+        reported = [turn['prompt_tokens'] for turn in turns if turn['prompt_tokens']]
+        return {
+            "turns": len(turns),
+            "last": self.turns[-1] if self.turns else None,
+            "avg_prompt_tokens": sum(reported) / len(reported) if reported else 0.0,
+            "avg_latency": sum(turn['latency'] for turn in turns) / len(turns) if turns else 0.0,
+            "summarized_messages": self.summary_upto
+        }
@@ -0,0 +1,103 @@
+"""Shared HTTP sessions and retry helpers."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Iterable
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import Config
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+def get_http_session(name: str = "default", pool_size: int = None) -> requests.Session:
+    """Return a process-wide keep-alive session, creating it on first use.
+    
+    Sessions are shared by every Streamlit session in the process, so
+    connections (and their TLS handshakes) are reused across users.
+    """
+    session = _sessions.get(name)
+    if session is not None:
+        return session
+    
+    with _sessions_lock:
+        if name not in _sessions:
+            pool_size = pool_size or Config.HTTP_POOL_SIZE
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size,
+                                  pool_block=True, max_retries=0)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[name] = session
+        return _sessions[name]
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except Exception:
+        return None
+
+def compute_backoff(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Return the delay before retry number ``attempt`` (0-based).
+    
+    Uses full-jitter exponential backoff unless the server asked for a
+    specific delay via Retry-After.
+    """
+    if retry_after is not None:
+        return retry_after
+    
+    ceiling = min(Config.RETRY_BACKOFF_MAX, Config.RETRY_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+def request_with_retry(session: requests.Session, method: str, url: str,
+                       max_retries: int = None,
+                       retry_statuses: Iterable[int] = None,
+                       before_retry: Optional[Callable[[], None]] = None,
+                       **kwargs) -> requests.Response:
+    """Send a request, retrying on retryable status codes and connect errors.
+    
+    The last response is returned as-is once retries are exhausted (or the
+    server asks us to wait longer than ``Config.RETRY_AFTER_MAX``), so callers
+    still decide how to surface the error. ``before_retry`` runs before each
+    retry, e.g. to wait for a fresh rate-limiter slot; it may raise to give up.
+    """
+    max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+    retry_statuses = set(retry_statuses or Config.RETRY_STATUS_CODES)
+    
+    attempt = 0
+    while True:
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.ConnectionError:
+            if attempt >= max_retries:
+                raise
+            time.sleep(compute_backoff(attempt))
+            attempt += 1
+            if before_retry is not None:
+                before_retry()
+            continue
+        
+        if response.status_code not in retry_statuses or attempt >= max_retries:
+            return response
+        
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None and retry_after > Config.RETRY_AFTER_MAX:
+            return response
+        
+        response.close()
+        time.sleep(compute_backoff(attempt, retry_after))
+        attempt += 1
+        if before_retry is not None:
+            before_retry()
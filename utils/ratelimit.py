@@ -0,0 +1,72 @@
+"""Token-bucket rate limiting with an injectable clock."""
+
+import threading
+import time
+from typing import Callable, Optional
+
+class TokenBucket:
+    """Thread-safe token bucket.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``clock`` and ``sleep`` can be replaced with fakes in tests.
+    """
+    
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        now = self.clock()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+    
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+    
+    def time_until_available(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` could be taken (0 if available now)."""
+        with self._lock:
+            self._refill()
+            missing = min(tokens, self.capacity) - self._tokens
+            return max(0.0, missing / self.rate) if missing > 0 else 0.0
+    
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available right now.
+        
+        Requests larger than the bucket are clamped to its capacity so they
+        can still be served once the bucket is full.
+        """
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until ``tokens`` are taken or ``timeout`` seconds pass."""
+        deadline = None if timeout is None else self.clock() + timeout
+        
+        while not self.try_acquire(tokens):
+            wait = self.time_until_available(tokens)
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining <= 0 or wait > remaining:
+                    return False
+            self.sleep(wait)
+        return True